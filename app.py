@@ -4,46 +4,221 @@
 # NOTE: Used CoPilot for code organization and easy understanding
 # ============================================================================
 
-from flask import Flask, render_template, request
-from flask_socketio import SocketIO, join_room
+from flask import Blueprint, Flask, abort, current_app, jsonify, request
+from flask_socketio import SocketIO, join_room, leave_room
 from flask_cors import CORS
 from game import Player, PokerRoom
+from static_cache import StaticCache
+from store import DEFAULT_MAX_LAG, DEFAULT_ROOM_TTL, open_store
+from ratelimit import RateLimiter
+from werkzeug.local import LocalProxy
+from functools import wraps
+import os
 import random
 import string
 
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_CORS_ORIGINS = "http://localhost:5173,http://localhost:3000,http://localhost:5000"
+
+def load_config():
+    """
+    Read server settings from environment variables (dev defaults).
+    
+    Returns:
+        dict: Flask config values
+    """
+    return {
+        "SECRET_KEY": os.environ.get("SECRET_KEY", "secret"),
+        # Comma-separated origins allowed to open Socket.IO connections
+        "CORS_ORIGINS": os.environ.get("CORS_ORIGINS", DEFAULT_CORS_ORIGINS).split(","),
+        # Room backend: memory://, sqlite:///rooms.db or redis://host:port/0
+        "ROOM_STORE": os.environ.get("ROOM_STORE", "memory://"),
+        # Max seconds durable room state may trail live state
+        "ROOM_STORE_MAX_LAG": float(os.environ.get("ROOM_STORE_MAX_LAG", DEFAULT_MAX_LAG)),
+        # Seconds an untouched room survives in the store (0 keeps rooms forever)
+        "ROOM_STORE_TTL": float(os.environ.get("ROOM_STORE_TTL", DEFAULT_ROOM_TTL)),
+        # Built React frontend (cd frontend && npm run build)
+        "FRONTEND_DIST": os.environ.get("FRONTEND_DIST", os.path.join(BASE_DIR, "frontend", "dist")),
+    }
+
+# Upper bound on actions accepted in one actions_batch event
+MAX_BATCH_ACTIONS = 500
+
+# Per-client event limits: {event: (tokens per second, burst)}
+# Per-IP limits are 10x these so a whole table behind one router still fits
+RATE_LIMITS = {
+    "create_room": (0.1, 3),
+    "join_room": (0.5, 5),
+    "leave_room": (0.5, 5),
+    "configure_game": (1, 5),
+    "open_config": (1, 5),
+    "close_config": (1, 5),
+    "actions_batch": (0.5, 3),
+    # Only limited per IP (each connection has a new SID): 5/s, bursts of 50
+    "connect": (0.5, 5),
+}
+DEFAULT_RATE_LIMIT = (5, 20)
+
 # ============================================================================
 # APP INITIALIZATION
+# Importing this module defines the handlers (and imports Flask/Socket.IO);
+# no app is built, no store opened and nothing compressed until create_app().
+# ============================================================================
+
+socketio = SocketIO()
+web = Blueprint("web", __name__)
+
+# Per-app state lives in app.extensions (set by create_app) and is looked up
+# through current_app, so separately built apps never share rooms or caches
+rooms = LocalProxy(lambda: current_app.extensions["rooms"])  # {room_code: PokerRoom}
+static_cache = LocalProxy(lambda: current_app.extensions["static_cache"])
+rate_limiter = LocalProxy(lambda: current_app.extensions["rate_limiter"])
+
+def create_app(config=None):
+    """
+    Build the Flask app: load config, attach Socket.IO and CORS, open the
+    room store and load static assets.
+    Note: `socketio` is module-level, so only the most recently built app
+    can serve Socket.IO traffic; HTTP state is fully per app.
+    
+    Args:
+        config: Optional dict overriding settings from the environment
+        
+    Returns:
+        Flask: Configured app (serve with socketio.run(app))
+    """
+    app = Flask(__name__)
+    app.config.update(load_config())
+    app.config.update(config or {})
+
+    socketio.init_app(app, cors_allowed_origins=app.config["CORS_ORIGINS"])
+    CORS(app)
+    app.register_blueprint(web)
+
+    app.extensions["rooms"] = open_store(app.config["ROOM_STORE"], max_lag=app.config["ROOM_STORE_MAX_LAG"],
+                                        ttl=app.config["ROOM_STORE_TTL"] or None)
+    app.extensions["rate_limiter"] = RateLimiter(RATE_LIMITS, DEFAULT_RATE_LIMIT)
+
+    # Page and built frontend, precompressed once here instead of on every request
+    dist = app.config["FRONTEND_DIST"]
+    cache = StaticCache()
+    cache.add_file("/", os.path.join(app.root_path, "templates", "index.html"))
+    cache.add_file("/app", os.path.join(dist, "index.html"))
+    cache.add_file("/vite.svg", os.path.join(dist, "vite.svg"))
+    cache.add_directory("/assets", os.path.join(dist, "assets"), immutable=True)
+    app.extensions["static_cache"] = cache
+
+    return app
+
+def __getattr__(name):
+    """Build `app` on first access, so `gunicorn app:app` still works."""
+    if name == "app":
+        globals()["app"] = create_app()
+        return globals()["app"]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def rate_limited(event):
+    """
+    Decorator: drop an event before its handler runs if the sender
+    (by socket ID or IP) is over the limit for that event type.
+    """
+    def decorator(handler):
+        @wraps(handler)
+        def wrapper(*args):
+            if not rate_limiter.allow(event, request.sid, request.remote_addr):
+                socketio.emit("error", {"message": "Too many requests - slow down"}, room=request.sid)
+                return
+            return handler(*args)
+        return wrapper
+    return decorator
+
+# ============================================================================
+# BROADCAST HELPERS
 # ============================================================================
 
-app = Flask(__name__)
-app.config["SECRET_KEY"] = "secret"
-socketio = SocketIO(app, cors_allowed_origins=["http://localhost:5173", "http://localhost:3000", "http://localhost:5000"])
-CORS(app)
+def emit_room_update(room):
+    """
+    Send room state: a private overlay to each seat, then the shared public
+    state broadcast once to the whole room (encoded a single time).
+    Overlays go first so clients already have them when the update renders.
+    """
+    room.version += 1
+    rooms.save(room)  # Queued for write-behind, returns immediately
+    for player in room.players:
+        socketio.emit("room_private", room.serialize_private(player.sid), room=player.sid)
+    socketio.emit("room_update", room.serialize(), room=room.code)
 
-# Global dictionary to track all active rooms: {room_code: PokerRoom}
-rooms = {}
+def remove_from_all_rooms(sid, reason):
+    """
+    Take a socket out of every room it is seated in, deleting rooms that
+    become empty. A socket holds at most one seat, so rooms can't pile up
+    behind one client (or outlive its connection).
+    
+    Args:
+        sid: Socket ID to remove
+        reason: Log text after the player's name (e.g. "disconnected.")
+    """
+    for room_code, room in list(rooms.items()):
+        player = next((p for p in room.players if p.sid == sid), None)
+        if not player:
+            continue
+
+        room.remove_player(sid)
+        room.history.clear()  # Snapshots still include the departed seat
+        leave_room(room_code, sid=sid)
+
+        # Delete rooms nobody connected is left in (seats still waiting
+        # to be reclaimed after a restart don't keep a room alive)
+        if not room.has_connected_players():
+            del rooms[room_code]
+        else:
+            # Notify remaining players
+            socketio.emit("action_log", {"message": f"{player.name} {reason}"}, room=room_code)
+            emit_room_update(room)
 
 # ============================================================================
 # HTTP ROUTES
 # ============================================================================
 
-@app.route("/")
+@web.route("/")
 def index():
     """Serve the main HTML page"""
-    return render_template("index.html")
+    return static_cache.response("/")
+
+@web.route("/app")
+@web.route("/vite.svg")
+@web.route("/assets/<path:filename>")
+def frontend(filename=None):
+    """Serve the built React frontend (404 if it hasn't been built)"""
+    return static_cache.response(request.path) or abort(404)
+
+@web.route("/metrics")
+def metrics():
+    """Server counters for monitoring (rooms, rate limiter rejections)"""
+    return jsonify({
+        "rooms": len(rooms.cache),
+        "rate_limit": rate_limiter.metrics()
+    })
 
 # ============================================================================
 # ROOM MANAGEMENT HANDLERS
 # ============================================================================
 
 @socketio.on("create_room")
+@rate_limited("create_room")
 def handle_create_room(data):
     """
     Create a new poker room with a random 5-character code.
     The creator becomes the room leader and first player.
     """
     name = data["name"]
-    global rooms
+    
+    # One seat per socket: creating a room leaves any previous one
+    remove_from_all_rooms(request.sid, "has left the room.")
     
     #generate alphanumeric room code
     while True:
@@ -62,9 +237,10 @@ def handle_create_room(data):
     print(f"{name} created and joined room {code} (SID {request.sid})")
     
     socketio.emit("room_created", {"code": code}, room=request.sid)
-    socketio.emit("room_update", room.serialize(), room=code)
+    emit_room_update(room)
 
 @socketio.on("join_room")
+@rate_limited("join_room")
 def handle_join(data):
     """
     Allow a player to join an existing room.
@@ -72,7 +248,6 @@ def handle_join(data):
     """
     name = data["name"]
     code = data["room"]
-    global rooms
 
     #validate room code exists
     if code not in rooms:
@@ -80,20 +255,40 @@ def handle_join(data):
         return
 
     room = rooms[code]
-    player = Player(request.sid, name, starting_chips=room.starting_chips)
+    if any(p.sid == request.sid for p in room.players):
+        return  # Already seated here
+
+    # Returning after a server restart: take back the seat with this name
+    returning = room.disconnected_seat(name) is not None
 
     #check if room is full
-    if not room.add_player(player):
-        return  
+    if len(room.players) >= 10 and not returning:
+        return
+
+    # One seat per socket: joining a room leaves any previous one
+    remove_from_all_rooms(request.sid, "has left the room.")
+
+    if returning:
+        room.reclaim_seat(name, request.sid)
+        join_room(code)
+        print(f"{name} rejoined room {code} (SID {request.sid})")
+        socketio.emit("action_log", {"message": f"{name} has rejoined the room."}, room=code)
+        emit_room_update(room)
+        return
+
+    player = Player(request.sid, name, starting_chips=room.starting_chips)
+    room.add_player(player)
+    room.history.clear()  # Snapshots don't include the new seat
 
     join_room(code)
     print(f"{name} joined room {code} (SID {request.sid})")
     
     #broadcast
     socketio.emit("action_log", {"message": f"{name} has joined the room."}, room=code)
-    socketio.emit("room_update", room.serialize(), room=code)
+    emit_room_update(room)
 
 @socketio.on("leave_room")
+@rate_limited("leave_room")
 def handle_leave_room(data):
     """
     Remove a player from the room.
@@ -110,22 +305,25 @@ def handle_leave_room(data):
         return
 
     room.remove_player(request.sid)
+    room.history.clear()  # Snapshots still include the departed seat
+    leave_room(room_code)  # Stop receiving this room's broadcasts
     
-    #clean up empty room
-    if len(room.players) == 0:
+    #clean up empty room (or one only holding unreclaimed seats)
+    if not room.has_connected_players():
         del rooms[room_code]
-        socketio.emit("action_log", {"message": f"Room {room_code} has been closed as the last player left."})
+        socketio.emit("action_log", {"message": f"Room {room_code} has been closed as the last player left."}, room=request.sid)
         return
     
     #broadcast
     socketio.emit("action_log", {"message": f"{player.name} has left the room."}, room=room_code)
-    socketio.emit("room_update", room.serialize(), room=room_code)
+    emit_room_update(room)
 
 # ============================================================================
 # GAME CONFIGURATION HANDLERS (LEADER ONLY)
 # ============================================================================
 
 @socketio.on("configure_game")
+@rate_limited("configure_game")
 def handle_configure_game(data):
     """
     Set starting chips and blind amounts for the room.
@@ -145,13 +343,15 @@ def handle_configure_game(data):
         socketio.emit("error", {"message": "Only the room leader can configure settings"}, room=request.sid)
         return
     
+    room.history.record(room.history.capture(room))
     room.configure_game(starting_chips, small_blind, big_blind)
     
     #broadcast
     socketio.emit("action_log", {"message": f"⚙️ Game configured: ${starting_chips:.2f} starting, Blinds ${small_blind:.2f}/${big_blind:.2f}"}, room=room_code)
-    socketio.emit("room_update", room.serialize(), room=room_code)
+    emit_room_update(room)
 
 @socketio.on("open_config")
+@rate_limited("open_config")
 def handle_open_config(data):
     """
     Show the configuration panel (leader only).
@@ -168,9 +368,10 @@ def handle_open_config(data):
         return
     
     room.show_config = True
-    socketio.emit("room_update", room.serialize(), room=room_code)
+    emit_room_update(room)
 
 @socketio.on("close_config")
+@rate_limited("close_config")
 def handle_close_config(data):
     """
     Hide the configuration panel (leader only).
@@ -186,19 +387,21 @@ def handle_close_config(data):
         return
     
     room.show_config = False
-    socketio.emit("room_update", room.serialize(), room=room_code)
+    emit_room_update(room)
 
 # ============================================================================
 # HAND MANAGEMENT HANDLERS
 # ============================================================================
 
 @socketio.on("start_hand")
+@rate_limited("start_hand")
 def handle_start_hand(data):
     """
     Start a new hand: rotate dealer, post blinds, reset betting.
     """
     code = data["code"]
     room = rooms[code]
+    room.history.record(room.history.capture(room))
     
     # Mark hand as started and hide config panel
     room.hand_started = True
@@ -217,9 +420,10 @@ def handle_start_hand(data):
     socketio.emit("action_log", {"message": f"--- New Hand Started ---"}, room=code)
     socketio.emit("action_log", {"message": f"{sb.name} posts small blind (${room.small_blind_amount:.2f})"}, room=code)
     socketio.emit("action_log", {"message": f"{bb.name} posts big blind (${room.big_blind_amount:.2f})"}, room=code)
-    socketio.emit("room_update", room.serialize(), room=code)
+    emit_room_update(room)
 
 @socketio.on("declare_winner")
+@rate_limited("declare_winner")
 def handle_declare_winner(data):
     """
     Manually declare a winner and award them the pot.
@@ -233,9 +437,6 @@ def handle_declare_winner(data):
     if not room:
         return
     
-    # Mark hand as ended
-    room.hand_started = False
-    
     # Permission check: Only leader can declare winner
     if room.leader_sid != request.sid:
         socketio.emit("error", {"message": "Only the room leader can declare the winner"}, room=request.sid)
@@ -246,6 +447,10 @@ def handle_declare_winner(data):
     if not winner:
         return
     
+    room.history.record(room.history.capture(room))
+    
+    # Mark hand as ended
+    room.hand_started = False
     winner.chips += room.pot
     pot_amount = room.pot
     room.pot = 0
@@ -253,14 +458,71 @@ def handle_declare_winner(data):
     
     # Log and broadcast
     socketio.emit("action_log", {"message": f"💰 {winner_name} wins ${pot_amount:.2f}!"}, room=room_code)
-    socketio.emit("room_update", room.serialize(), room=room_code)
+    emit_room_update(room)
     socketio.emit("hand_over", {"winner": winner_name, "pot": pot_amount}, room=room_code)
 
+@socketio.on("undo")
+@rate_limited("undo")
+def handle_undo(data):
+    """
+    Roll back the last action (bet, fold, blinds, winner, config).
+    Only leader can undo.
+    """
+    room_code = data["room"]
+    room = rooms.get(room_code)
+    if not room:
+        return
+    
+    # Permission check: Only leader can undo
+    if room.leader_sid != request.sid:
+        socketio.emit("error", {"message": "Only the room leader can undo actions"}, room=request.sid)
+        return
+    
+    if not room.history.undo(room):
+        socketio.emit("error", {"message": "Nothing to undo"}, room=request.sid)
+        return
+    
+    socketio.emit("action_log", {"message": "↩️ Leader undid the last action"}, room=room_code)
+    emit_room_update(room)
+
+@socketio.on("redo")
+@rate_limited("redo")
+def handle_redo(data):
+    """
+    Re-apply the last undone action.
+    Only leader can redo.
+    """
+    room_code = data["room"]
+    room = rooms.get(room_code)
+    if not room:
+        return
+    
+    # Permission check: Only leader can redo
+    if room.leader_sid != request.sid:
+        socketio.emit("error", {"message": "Only the room leader can redo actions"}, room=request.sid)
+        return
+    
+    if not room.history.redo(room):
+        socketio.emit("error", {"message": "Nothing to redo"}, room=request.sid)
+        return
+    
+    socketio.emit("action_log", {"message": "↪️ Leader redid the last action"}, room=room_code)
+    emit_room_update(room)
+
 # ============================================================================
 # PLAYER ACTION HANDLERS
 # ============================================================================
 
+def emit_hand_over(room_code, result):
+    """Broadcast the end of a hand won by everyone else folding."""
+    socketio.emit("hand_over", result, room=room_code)
+
+def is_number(value):
+    """True for int/float amounts (bools and numeric strings are rejected)."""
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
 @socketio.on("action")
+@rate_limited("action")
 def handle_action(data):
     """
     Process player betting actions: fold, check, call, raise.
@@ -274,54 +536,27 @@ def handle_action(data):
     if not room:
         return
 
-    # Auto-start hand if not already started (legacy behavior)
-    if not room.in_hand or len(room.in_hand) == 0:
-        room.start_hand()
+    if not is_number(amount):
+        socketio.emit("error", {"message": "Amount must be a number"}, room=request.sid)
+        return
+
+    # State before this action, recorded for undo once the action is applied
+    before = room.history.capture(room)
 
-    # Validate it's this player's turn
-    player = room.get_current_player()
-    if player is None or player.sid != request.sid:
-        socketio.emit("action_log", {"message": "Not your turn!"}, room=room_code)  
+    game_action, messages = room.apply_action(request.sid, action_type, amount)
+    if game_action is None:
+        # Only the sender needs to know why their action was refused
+        socketio.emit("error", {"message": messages[0]}, room=request.sid)
         return
 
-    # Process different action types
-    if action_type == "fold":
-        room.players_to_act.discard(player.sid)
-        room.fold_current_player()
-        socketio.emit("action_log", {"message": f"{player.name} folds"}, room=room_code)
-
-    elif action_type == "check":
-        if not room.can_check(player.sid):
-            return  # Can't check - need to call or fold
-        room.players_to_act.discard(player.sid)
-        socketio.emit("action_log", {"message": f"{player.name} checks"}, room=room_code)
-
-    elif action_type == "call":
-        call_amount = room.current_bet - room.bets[player.sid]
-        room.call(player.sid)
-        room.players_to_act.discard(player.sid)
-        socketio.emit("action_log", {"message": f"{player.name} calls {call_amount}"}, room=room_code)
-        
-    elif action_type == "raise":
-        if amount <= 0:
-            return  # Invalid raise amount
-        if not room.raise_bet(player.sid, amount):
-            return  # Not enough chips
-        # Reset players to act (everyone except raiser needs to respond)
-        room.players_to_act = {p.sid for p in room.in_hand if p.sid != player.sid}
-        socketio.emit("action_log", {"message": f"{player.name} raises ${amount:.2f}"}, room=room_code)
-
-    # ========================================================================
-    # GAME FLOW - Centralized turn advancement logic
-    # ========================================================================
-    
-    game_action = room.process_action_and_advance()
-    socketio.emit("room_update", room.serialize(), room=room_code)
+    for message in messages:
+        socketio.emit("action_log", {"message": message}, room=room_code)
+
+    room.history.record(before)
+    emit_room_update(room)
     
     if game_action == 'end_hand':
-        socketio.emit("hand_over", {"winner": room.players[0].name if room.in_hand else "Unknown", "pot": 0}, room=room_code)
-    elif game_action == 'advance_round':
-        socketio.emit("action_log", {"message": f"--- {room.round.upper()} ---"}, room=room_code)
+        emit_hand_over(room_code, room.last_hand_result)
     
     # Debug logging
     print(
@@ -331,13 +566,111 @@ def handle_action(data):
         "TO_ACT:", room.players_to_act
     )
 
+@socketio.on("actions_batch")
+@rate_limited("actions_batch")
+def handle_actions_batch(data):
+    """
+    Apply an ordered list of actions in one go (e.g. leader replaying a hand
+    recorded on paper, or an automated table client).
+    All-or-nothing: if any action is rejected the room is rolled back and
+    nothing is broadcast. On success, one room update is sent at the end.
+    
+    Each action is {"action": ..., "amount": ..., "player": name}.
+    Only the leader may act for other players ("player" defaults to the sender).
+    A batch can't run past the end of a hand.
+    """
+    room_code = data["room"]
+    actions = data.get("actions")
+
+    room = rooms.get(room_code)
+    if not room:
+        return
+
+    if not isinstance(actions, list) or not 1 <= len(actions) <= MAX_BATCH_ACTIONS:
+        socketio.emit("error", {"message": f"A batch must contain 1-{MAX_BATCH_ACTIONS} actions"}, room=request.sid)
+        return
+
+    # Check the whole payload before touching the room
+    for i, item in enumerate(actions):
+        if (not isinstance(item, dict)
+                or not isinstance(item.get("action"), str)
+                or not is_number(item.get("amount", 0))
+                or not isinstance(item.get("player", ""), str)):
+            socketio.emit("error", {"message": f"Batch rejected at action {i + 1}: malformed action. No actions were applied."}, room=request.sid)
+            return
+
+    before = room.history.capture(room)
+    try:
+        log, hand_result = apply_batch(room, actions, before)
+    except Exception as e:
+        # Never leave the room half-applied, whatever went wrong
+        room.restore(before)
+        print("ACTIONS_BATCH FAILED:", repr(e))
+        socketio.emit("error", {"message": "Batch failed on the server. No actions were applied."}, room=request.sid)
+        return
+    if log is None:
+        return
+
+    room.history.record(before)
+    for message in log:
+        socketio.emit("action_log", {"message": message}, room=room_code)
+    emit_room_update(room)
+    if hand_result:
+        emit_hand_over(room_code, hand_result)
+
+def apply_batch(room, actions, before):
+    """
+    Helper for handle_actions_batch: apply each action in order.
+    On the first rejected action, restores `before` and tells the sender.
+    A batch covers at most one hand: actions after the hand ends are
+    rejected (the leader starts the next hand with start_hand).
+    
+    Returns:
+        tuple: (log messages, hand_over result or None), or (None, None) if rejected
+    """
+    log = []
+    hand_result = None
+
+    for i, item in enumerate(actions):
+        sid = request.sid
+        reason = None
+        if hand_result is not None:
+            reason = "The hand is already over"
+        elif item.get("player") is not None:
+            player = next((p for p in room.players if p.name == item["player"]), None)
+            if player is None:
+                reason = f"No player named {item['player']}"
+            elif player.sid != request.sid and room.leader_sid != request.sid:
+                reason = "Only the room leader can submit actions for other players"
+            else:
+                sid = player.sid
+
+        if reason is None:
+            game_action, messages = room.apply_action(sid, item.get("action"), item.get("amount", 0))
+            if game_action is None:
+                reason = messages[0]
+
+        # Roll back the whole batch on the first rejected action
+        if reason is not None:
+            room.restore(before)
+            socketio.emit("error", {"message": f"Batch rejected at action {i + 1}: {reason.rstrip('!.')}. No actions were applied."}, room=request.sid)
+            return None, None
+
+        log.extend(messages)
+        if game_action == 'end_hand':
+            hand_result = dict(room.last_hand_result)
+
+    return log, hand_result
+
 # ============================================================================
 # CONNECTION HANDLERS
 # ============================================================================
 
 @socketio.on("connect")
 def handle_connect():
-    """Log when a client connects"""
+    """Log when a client connects; refuse IPs that connect too often"""
+    if not rate_limiter.allow("connect", None, request.remote_addr):
+        return False
     print("Client connected")
 
 @socketio.on("disconnect")
@@ -346,24 +679,11 @@ def handle_disconnect():
     Auto-remove player from room when they disconnect.
     Prevents ghost players from blocking game progress.
     """
-    # Find which room this player is in
-    for room_code, room in list(rooms.items()):
-        player = next((p for p in room.players if p.sid == request.sid), None)
-        if player:
-            room.remove_player(request.sid)
-            
-            # Delete empty rooms
-            if len(room.players) == 0:
-                del rooms[room_code]
-            else:
-                # Notify remaining players
-                socketio.emit("action_log", {"message": f"{player.name} disconnected."}, room=room_code)
-                socketio.emit("room_update", room.serialize(), room=room_code)
-            break
+    remove_from_all_rooms(request.sid, "disconnected.")
 
 # ============================================================================
 # RUN SERVER
 # ============================================================================
 
 if __name__ == "__main__":
-    socketio.run(app, debug=True)
+    socketio.run(create_app(), debug=True)
@@ -0,0 +1,100 @@
+# ============================================================================
+# POKER CHIP TRACKER - STARTUP BENCHMARK
+# Measures cold import time for each module and first-request latency of the
+# web app, each in a fresh interpreter.
+#
+# Usage:
+#   python bench_startup.py --runs 10
+# ============================================================================
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+# Each probe runs in a new interpreter and prints {"label": milliseconds}
+PROBES = {
+    "engine": """
+import time
+t = time.perf_counter()
+import game
+elapsed = time.perf_counter() - t
+assert "flask" not in sys.modules, "game.py pulled in the web stack"
+results["import game"] = elapsed
+t = time.perf_counter()
+import store, ratelimit
+results["import store + ratelimit"] = time.perf_counter() - t
+assert "flask" not in sys.modules, "store/ratelimit pulled in the web stack"
+""",
+    "web": """
+import time
+t = time.perf_counter()
+import app as server
+results["import app"] = time.perf_counter() - t
+
+t = time.perf_counter()
+flask_app = server.create_app()
+results["create_app()"] = time.perf_counter() - t
+
+client = flask_app.test_client()
+t = time.perf_counter()
+response = client.get("/", headers={"Accept-Encoding": "gzip, br"})
+assert response.status_code == 200
+results["first GET /"] = time.perf_counter() - t
+
+t = time.perf_counter()
+sio = server.socketio.test_client(flask_app)
+sio.emit("create_room", {"name": "bench"})
+assert any(m["name"] == "room_created" for m in sio.get_received())
+results["first create_room"] = time.perf_counter() - t
+""",
+}
+
+PROBE_TEMPLATE = """
+import contextlib, io, json, sys
+results = {}
+with contextlib.redirect_stdout(io.StringIO()):
+%s
+print(json.dumps({k: v * 1000 for k, v in results.items()}))
+"""
+
+
+def run_probe(code):
+    """
+    Run one probe in a fresh interpreter.
+
+    Args:
+        code: Probe body (fills the `results` dict with seconds)
+
+    Returns:
+        dict: {label: milliseconds}
+    """
+    body = "\n".join("    " + line for line in code.strip().splitlines())
+    out = subprocess.run(
+        [sys.executable, "-c", PROBE_TEMPLATE % body],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        capture_output=True, text=True, check=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark import and first-request latency.")
+    parser.add_argument("--runs", type=int, default=5, help="fresh interpreters per probe")
+    args = parser.parse_args(argv)
+
+    timings = {}
+    for code in PROBES.values():
+        for _ in range(args.runs):
+            for label, ms in run_probe(code).items():
+                timings.setdefault(label, []).append(ms)
+
+    print(f"{'step':<28}{'median ms':>12}{'min ms':>10}")
+    for label, values in timings.items():
+        print(f"{label:<28}{statistics.median(values):>12.1f}{min(values):>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -11,6 +11,7 @@ function App() {
   const [roomCode, setRoomCode] = useState('')
   const [playerName, setPlayerName] = useState('')
   const [gameState, setGameState] = useState(null)
+  const [you, setYou] = useState(null)
 
   useEffect(() => {
     // Connect to Flask backend
@@ -34,6 +35,11 @@ function App() {
       setGameState(data)
     })
 
+    // Private per-seat overlay (seat, leadership, own call amount)
+    newSocket.on('room_private', (data) => {
+      setYou(data)
+    })
+
     newSocket.on('join_error', (data) => {
       alert(data.message)
     })
@@ -62,6 +68,7 @@ function App() {
     setInRoom(false)
     setRoomCode('')
     setGameState(null)
+    setYou(null)
   }
 
   if (!inRoom) {
@@ -73,6 +80,7 @@ function App() {
       socket={socket} 
       roomCode={roomCode} 
       gameState={gameState} 
+      you={you}
       playerName={playerName}
       onLeave={handleLeaveRoom}
     />
@@ -29,6 +29,14 @@ export default function ActionButtons({ socket, roomCode, gameState, playerName,
     setSelectedWinner('')
   }
 
+  const handleUndo = () => {
+    socket?.emit('undo', { room: roomCode })
+  }
+
+  const handleRedo = () => {
+    socket?.emit('redo', { room: roomCode })
+  }
+
   return (
     <div className="action-buttons-container">
       <h3>Game Controls</h3>
@@ -114,6 +122,17 @@ export default function ActionButtons({ socket, roomCode, gameState, playerName,
           </button>
         </div>
       )}
+
+      {isLeader && (
+        <div className="actions-group">
+          <button className="card-glass-button action-btn" onClick={handleUndo}>
+            Undo
+          </button>
+          <button className="card-glass-button action-btn" onClick={handleRedo}>
+            Redo
+          </button>
+        </div>
+      )}
     </div>
   )
 }
@@ -6,7 +6,7 @@ import ActionLog from './ActionLog'
 import ActionButtons from './ActionButtons'
 import GameConfig from './GameConfig'
 
-export default function GameRoom({ socket, roomCode, gameState, playerName, onLeave }) {
+export default function GameRoom({ socket, roomCode, gameState, you, playerName, onLeave }) {
   const [actions, setActions] = useState([])
   const [isLeader, setIsLeader] = useState(false)
   const [showMessage, setShowMessage] = useState(false)
@@ -23,17 +23,21 @@ export default function GameRoom({ socket, roomCode, gameState, playerName, onLe
       setActions(prev => [...prev, `💰 ${data.winner} wins $${data.pot.toFixed(2)}!`])
     })
 
+    // Refused actions are sent only to us; show them in our own log
+    socket.on('error', (data) => {
+      setActions(prev => [...prev, `⚠️ ${data.message}`])
+    })
+
     return () => {
       socket.off('action_log')
       socket.off('hand_over')
+      socket.off('error')
     }
   }, [socket])
 
   useEffect(() => {
-    if (gameState && socket) {
-      setIsLeader(socket.id === gameState.leader_sid)
-    }
-  }, [gameState, socket])
+    setIsLeader(!!you?.is_leader)
+  }, [you])
 
   if (!gameState) {
     return (
@@ -4,6 +4,18 @@
 # NOTE: Used CoPilot for code organization and easy understanding
 # ============================================================================
 
+from collections import deque
+
+# Number of actions the room leader can undo
+UNDO_LIMIT = 20
+
+# Scalar PokerRoom fields captured by snapshots
+SNAPSHOT_FIELDS = (
+    "pot", "current_bet", "round", "hand_started",
+    "dealer_index", "small_blind_index", "big_blind_index", "turn_index",
+    "starting_chips", "small_blind_amount", "big_blind_amount", "game_configured",
+)
+
 # ============================================================================
 # PLAYER CLASS
 # ============================================================================
@@ -26,6 +38,7 @@ class Player:
         self.sid = sid
         self.name = name
         self.chips = starting_chips
+        self.connected = True  # False for seats reloaded from a room store
         
     def serialize(self):
         """
@@ -34,7 +47,8 @@ class Player:
         """
         return {
             "name": self.name,
-            "chips": self.chips
+            "chips": self.chips,
+            "connected": self.connected
         }
 
 # ============================================================================
@@ -70,6 +84,7 @@ class PokerRoom:
         self.bets = {}  # {player_sid: amount_bet_this_round}
         self.round = "preflop"  # preflop, flop, turn, river, showdown
         self.community_cards = []  # Not used (manual chip tracking only)
+        self.last_hand_result = None  # {"winner", "pot"} of the last hand won by folds
         
         # Position tracking
         self.dealer_index = 0
@@ -87,6 +102,12 @@ class PokerRoom:
         self.big_blind_amount = 0.20
         self.game_configured = False  # Whether leader has set custom settings
 
+        # Bumped on every broadcast so private overlays match their public state
+        self.version = 0
+
+        # Leader undo/redo of recent actions
+        self.history = RoomHistory()
+
     # ========================================================================
     # PLAYER MANAGEMENT
     # ========================================================================
@@ -148,6 +169,49 @@ class PokerRoom:
     
         return True
 
+    def reclaim_seat(self, name, player_sid):
+        """
+        Give a disconnected seat (reloaded after a server restart) to a
+        new socket that joins with the same name. Chips, bets and turn
+        order carry over. If the leader's seat is still disconnected,
+        the returning player becomes leader.
+        
+        Args:
+            name: Display name of the seat to reclaim
+            player_sid: Socket ID of the returning player
+            
+        Returns:
+            Player: The reclaimed seat, or None if no disconnected seat has that name
+        """
+        player = self.disconnected_seat(name)
+        if not player:
+            return None
+
+        # Re-key everything that refers to the old (dead) socket ID
+        old_sid = player.sid
+        player.sid = player_sid
+        player.connected = True
+        if old_sid in self.players_to_act:
+            self.players_to_act.discard(old_sid)
+            self.players_to_act.add(player_sid)
+        if old_sid in self.bets:
+            self.bets[player_sid] = self.bets.pop(old_sid)
+
+        leader = next((p for p in self.players if p.sid == self.leader_sid), None)
+        if self.leader_sid == old_sid or leader is None or not leader.connected:
+            self.leader_sid = player_sid
+
+        self.history.clear()  # Snapshots are keyed by the old socket ID
+        return player
+
+    def disconnected_seat(self, name):
+        """Return the disconnected seat with this name, or None."""
+        return next((p for p in self.players if not p.connected and p.name == name), None)
+
+    def has_connected_players(self):
+        """True if at least one seat has a live socket behind it."""
+        return any(p.connected for p in self.players)
+
     # ========================================================================
     # GAME CONFIGURATION
     # ========================================================================
@@ -216,6 +280,8 @@ class PokerRoom:
         """
         Award pot to last remaining player (used when everyone else folds).
         
+        Records the outcome in last_hand_result.
+        
         Returns:
             Player: Winner object, or None if no clear winner
         """
@@ -223,8 +289,10 @@ class PokerRoom:
             winner = self.in_hand[0]
             winner.chips += self.pot
             print(f"{winner.name} wins {self.pot} chips!")
+            self.last_hand_result = {"winner": winner.name, "pot": self.pot}
             self.pot = 0
             return winner
+        self.last_hand_result = {"winner": "Unknown", "pot": 0}
         return None
 
     # ========================================================================
@@ -435,16 +503,134 @@ class PokerRoom:
         self.players_to_act.discard(player.sid)
         self.bets.pop(player.sid, None)
 
+    def apply_action(self, sid, action_type, amount=0):
+        """
+        Validate and apply one betting action, then advance the game.
+        Shared by the "action" and "actions_batch" server events and the
+        simulator, so all follow exactly the same rules. Emits nothing.
+
+        Args:
+            sid: Socket ID of the player acting
+            action_type: "fold", "check", "call" or "raise"
+            amount: Raise amount (raise only)
+
+        Returns:
+            tuple: (game_action, messages) - game_action is the result of
+                   process_action_and_advance, or None if the action was
+                   rejected (messages then holds the reason)
+        """
+        # Auto-start hand if not already started (legacy behavior)
+        if not self.in_hand or len(self.in_hand) == 0:
+            self.start_hand()
+
+        # Validate it's this player's turn
+        player = self.get_current_player()
+        if player is None or player.sid != sid:
+            return None, ["Not your turn!"]
+
+        # Process different action types
+        if action_type == "fold":
+            self.players_to_act.discard(player.sid)
+            self.fold_current_player()
+            messages = [f"{player.name} folds"]
+
+        elif action_type == "check":
+            if not self.can_check(player.sid):
+                return None, [f"{player.name} can't check - need to call or fold"]
+            self.players_to_act.discard(player.sid)
+            messages = [f"{player.name} checks"]
+
+        elif action_type == "call":
+            call_amount = self.current_bet - self.bets[player.sid]
+            self.call(player.sid)
+            self.players_to_act.discard(player.sid)
+            messages = [f"{player.name} calls {call_amount}"]
+
+        elif action_type == "raise":
+            if amount <= 0:
+                return None, ["Invalid raise amount"]
+            if not self.raise_bet(player.sid, amount):
+                return None, [f"{player.name} doesn't have enough chips to raise ${amount:.2f}"]
+            # Reset players to act (everyone except raiser needs to respond)
+            self.players_to_act = {p.sid for p in self.in_hand if p.sid != player.sid}
+            messages = [f"{player.name} raises ${amount:.2f}"]
+
+        else:
+            return None, [f"Unknown action: {action_type}"]
+
+        # Game flow - centralized turn advancement logic
+        game_action = self.process_action_and_advance()
+        if game_action == 'advance_round':
+            messages.append(f"--- {self.round.upper()} ---")
+        return game_action, messages
+
+    # ========================================================================
+    # SNAPSHOTS (UNDO / REDO)
+    # ========================================================================
+
+    def snapshot(self, previous=None):
+        """
+        Capture the room's game state as immutable values.
+        Any part equal to the previous snapshot reuses that snapshot's
+        object, so consecutive snapshots only use new memory for what
+        changed. Building one still walks the whole room (at most 10 seats).
+        
+        Args:
+            previous: Earlier snapshot to share unchanged parts with
+            
+        Returns:
+            dict: Snapshot that can be passed to restore()
+        """
+        state = {field: getattr(self, field) for field in SNAPSHOT_FIELDS}
+        state["seats"] = tuple(p.sid for p in self.players)
+        state["chips"] = tuple(p.chips for p in self.players)
+        state["in_hand"] = tuple(p.sid for p in self.in_hand)
+        state["players_to_act"] = frozenset(self.players_to_act)
+        state["bets"] = tuple(self.bets.items())
+
+        if previous:
+            for key, value in state.items():
+                if previous[key] == value:
+                    state[key] = previous[key]
+        return state
+
+    def restore(self, snapshot):
+        """
+        Put the room back into a snapshotted state.
+        
+        Args:
+            snapshot: Dict returned by snapshot()
+            
+        Returns:
+            bool: True if restored, False if the seated players have changed
+        """
+        if snapshot["seats"] != tuple(p.sid for p in self.players):
+            return False
+
+        for field in SNAPSHOT_FIELDS:
+            setattr(self, field, snapshot[field])
+        for player, chips in zip(self.players, snapshot["chips"]):
+            player.chips = chips
+
+        by_sid = {p.sid: p for p in self.players}
+        self.in_hand = [by_sid[sid] for sid in snapshot["in_hand"]]
+        self.players_to_act = set(snapshot["players_to_act"])
+        self.bets = dict(snapshot["bets"])
+        return True
+
     # ========================================================================
     # DATA SERIALIZATION
     # ========================================================================
 
     def serialize(self):
         """
-        Convert room state to dictionary for JSON transmission to clients.
+        Convert the shared public room state to a dictionary for JSON
+        transmission. Identical for every recipient, so it is broadcast
+        (and encoded) once per version. Per-seat data lives in
+        serialize_private().
         
         Returns:
-            dict: Complete room state including players, pot, turn, settings
+            dict: Public room state including players, pot, turn, settings
         """
         current = self.get_current_player()
         call_amount = 0
@@ -454,11 +640,11 @@ class PokerRoom:
         return {
             # Room info
             "code": self.code,
-            "leader_sid": self.leader_sid,
+            "version": self.version,
             
             # Players
             "players": [p.serialize() for p in self.players],
-            "current_turn": self.get_current_player().name if self.get_current_player() else None,
+            "current_turn": current.name if current else None,
             "dealer": self.players[self.dealer_index].name if self.players else None,
             
             # Game state
@@ -477,3 +663,172 @@ class PokerRoom:
             "hand_started": self.hand_started,
             "show_config": self.show_config
         }
+
+    def serialize_private(self, player_sid):
+        """
+        Build the small per-seat overlay sent only to one player.
+        Carries their own seat data and privileged flags (e.g. leadership).
+        
+        Args:
+            player_sid: Socket ID of the recipient
+            
+        Returns:
+            dict: Private view for that player, or None if not seated
+        """
+        player = next((p for p in self.players if p.sid == player_sid), None)
+        if not player:
+            return None
+
+        in_hand = player in self.in_hand
+        current = self.get_current_player()
+        return {
+            "version": self.version,
+            "seat": self.players.index(player),
+            "is_leader": self.leader_sid == player_sid,
+            "is_turn": in_hand and current is player,
+            "in_hand": in_hand,
+            "call_amount": self.current_bet - self.bets.get(player_sid, 0) if in_hand else 0
+        }
+
+    def to_dict(self):
+        """
+        Convert the full room state (including socket IDs) to a dictionary
+        for persistence in a room store. Never sent to clients.
+        Undo history is not included.
+        
+        Returns:
+            dict: JSON-serializable room state
+        """
+        state = {field: getattr(self, field) for field in SNAPSHOT_FIELDS}
+        state.update({
+            "code": self.code,
+            "leader_sid": self.leader_sid,
+            "players": [[p.sid, p.name, p.chips] for p in self.players],
+            "in_hand": [p.sid for p in self.in_hand],
+            "players_to_act": sorted(self.players_to_act),
+            "bets": self.bets,
+            "community_cards": self.community_cards,
+            "show_config": self.show_config,
+            "version": self.version
+        })
+        return state
+
+    @classmethod
+    def from_dict(cls, state):
+        """
+        Rebuild a room from to_dict() output.
+        The saved socket IDs died with the old server process, so every
+        seat comes back disconnected until its player rejoins by name
+        (see reclaim_seat()).
+        
+        Args:
+            state: Dictionary produced by to_dict()
+            
+        Returns:
+            PokerRoom: Restored room (with empty undo history)
+        """
+        room = cls(state["code"], leader_sid=state["leader_sid"])
+        for field in SNAPSHOT_FIELDS:
+            setattr(room, field, state[field])
+        for sid, name, chips in state["players"]:
+            player = Player(sid, name, starting_chips=chips)
+            player.connected = False
+            room.players.append(player)
+
+        by_sid = {p.sid: p for p in room.players}
+        room.in_hand = [by_sid[sid] for sid in state["in_hand"]]
+        room.players_to_act = set(state["players_to_act"])
+        room.bets = dict(state["bets"])
+        room.community_cards = list(state["community_cards"])
+        room.show_config = state["show_config"]
+        room.version = state["version"]
+        return room
+
+# ============================================================================
+# ROOM HISTORY CLASS
+# ============================================================================
+
+class RoomHistory:
+    """
+    Bounded undo/redo stacks of PokerRoom snapshots.
+    Holds at most `limit` snapshots in each direction per room.
+    """
+
+    def __init__(self, limit=UNDO_LIMIT):
+        """
+        Initialize empty history.
+        
+        Args:
+            limit: Maximum number of undoable actions
+        """
+        self.undo_stack = deque(maxlen=limit)
+        self.redo_stack = deque(maxlen=limit)
+        self.last = None  # Most recent snapshot, shared with by the next one
+
+    def capture(self, room):
+        """
+        Snapshot the room, sharing unchanged parts with the last snapshot
+        taken so recorded history stays small.
+        
+        Args:
+            room: PokerRoom to snapshot
+            
+        Returns:
+            dict: Snapshot to pass to record() (or room.restore())
+        """
+        self.last = room.snapshot(self.last)
+        return self.last
+
+    def record(self, snapshot):
+        """
+        Save the state from before an action. Clears the redo stack.
+        
+        Args:
+            snapshot: Room snapshot taken before the action was applied
+        """
+        self.undo_stack.append(snapshot)
+        self.redo_stack.clear()
+
+    def clear(self):
+        """Forget all history (e.g. when a player joins or leaves)."""
+        self.undo_stack.clear()
+        self.redo_stack.clear()
+        self.last = None
+
+    def undo(self, room):
+        """
+        Roll the room back one action.
+        
+        Args:
+            room: PokerRoom to restore
+            
+        Returns:
+            bool: True if undone, False if there is nothing to undo
+        """
+        return self._step(room, self.undo_stack, self.redo_stack)
+
+    def redo(self, room):
+        """
+        Re-apply the last undone action.
+        
+        Args:
+            room: PokerRoom to restore
+            
+        Returns:
+            bool: True if redone, False if there is nothing to redo
+        """
+        return self._step(room, self.redo_stack, self.undo_stack)
+
+    def _step(self, room, source, target):
+        """Helper: restore the top of `source`, saving current state on `target`."""
+        if not source:
+            return False
+
+        current = self.capture(room)
+        if not room.restore(source[-1]):
+            self.clear()  # Seats changed underneath us; history is stale
+            return False
+
+        source.pop()
+        target.append(current)
+        return True
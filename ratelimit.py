@@ -0,0 +1,152 @@
+# ============================================================================
+# POKER CHIP TRACKER - RATE LIMITING
+# Token-bucket limits per event type, keyed by socket ID and by client IP.
+# Every check is O(1); idle buckets expire automatically.
+# ============================================================================
+
+import threading
+import time
+from collections import Counter, OrderedDict
+
+# Buckets untouched for this many seconds are dropped
+DEFAULT_IDLE_TTL = 300
+
+# Hard cap on live buckets (oldest idle ones are evicted first)
+DEFAULT_MAX_BUCKETS = 100000
+
+# ============================================================================
+# TOKEN BUCKET
+# ============================================================================
+
+class TokenBucket:
+    """
+    Holds up to `burst` tokens, refilled at `rate` tokens per second.
+    Each event spends one token.
+    """
+
+    __slots__ = ("tokens", "updated")
+
+    def __init__(self, burst, now):
+        """
+        Initialize a full bucket.
+
+        Args:
+            burst: Bucket capacity
+            now: Current time (time.monotonic())
+        """
+        self.tokens = burst
+        self.updated = now
+
+    def take(self, rate, burst, now):
+        """
+        Refill for the time elapsed, then try to spend one token.
+
+        Args:
+            rate: Tokens added per second
+            burst: Bucket capacity
+            now: Current time (time.monotonic())
+
+        Returns:
+            bool: True if a token was available
+        """
+        self.tokens = min(burst, self.tokens + (now - self.updated) * rate)
+        self.updated = now
+        if self.tokens < 1:
+            return False
+        self.tokens -= 1
+        return True
+
+# ============================================================================
+# RATE LIMITER
+# ============================================================================
+
+class RateLimiter:
+    """
+    Per-event token buckets for each socket ID and each client IP.
+    Buckets are kept in least-recently-used order so expiring idle ones
+    only ever looks at the oldest few.
+    """
+
+    def __init__(self, limits, default_limit, ip_multiplier=10,
+                 idle_ttl=DEFAULT_IDLE_TTL, max_buckets=DEFAULT_MAX_BUCKETS):
+        """
+        Initialize the limiter.
+
+        Args:
+            limits: {event_name: (tokens_per_second, burst)} per socket ID
+            default_limit: (tokens_per_second, burst) for unlisted events
+            ip_multiplier: Per-IP limits are this many times the per-SID
+                           limits (players at one table often share an IP)
+            idle_ttl: Seconds after which an untouched bucket is dropped
+            max_buckets: Maximum number of buckets kept at once
+        """
+        self.limits = limits
+        self.default_limit = default_limit
+        self.ip_multiplier = ip_multiplier
+        self.idle_ttl = idle_ttl
+        self.max_buckets = max_buckets
+
+        self.buckets = OrderedDict()  # {(scope, key, event): TokenBucket}
+        self.rejections = Counter()  # {(event, scope): count}
+        self.lock = threading.Lock()
+
+    def allow(self, event, sid, ip):
+        """
+        Check (and spend) one token from both the SID and IP buckets.
+        Either key may be None to skip that bucket (e.g. on connect the
+        SID is brand new, so only the IP is limited).
+
+        Args:
+            event: Socket.IO event name
+            sid: Socket ID of the sender
+            ip: Sender's IP address
+
+        Returns:
+            bool: True if the event may be handled
+        """
+        rate, burst = self.limits.get(event, self.default_limit)
+        now = time.monotonic()
+
+        with self.lock:
+            self._expire(now)
+            if sid and not self._take(("sid", sid, event), rate, burst, now):
+                self.rejections[(event, "sid")] += 1
+                return False
+            if ip and not self._take(("ip", ip, event), rate * self.ip_multiplier,
+                                     burst * self.ip_multiplier, now):
+                self.rejections[(event, "ip")] += 1
+                return False
+        return True
+
+    def _take(self, key, rate, burst, now):
+        """Helper: spend a token from one bucket, creating it if needed."""
+        bucket = self.buckets.get(key)
+        if bucket is None:
+            bucket = self.buckets[key] = TokenBucket(burst, now)
+            if len(self.buckets) > self.max_buckets:
+                self.buckets.popitem(last=False)
+        else:
+            self.buckets.move_to_end(key)
+        return bucket.take(rate, burst, now)
+
+    def _expire(self, now):
+        """Helper: drop buckets idle longer than idle_ttl (oldest first)."""
+        while self.buckets:
+            bucket = next(iter(self.buckets.values()))
+            if now - bucket.updated < self.idle_ttl:
+                break
+            self.buckets.popitem(last=False)
+
+    def metrics(self):
+        """
+        Summarize limiter state for monitoring.
+
+        Returns:
+            dict: Live bucket count and rejections per event and scope
+        """
+        with self.lock:
+            return {
+                "buckets": len(self.buckets),
+                "rejections": {f"{event}:{scope}": count
+                               for (event, scope), count in self.rejections.items()}
+            }
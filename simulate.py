@@ -0,0 +1,309 @@
+# ============================================================================
+# POKER CHIP TRACKER - HEADLESS HAND SIMULATOR
+# Plays random legal hands straight through PokerRoom (no Socket.IO layer)
+# and checks game-state invariants after every step.
+#
+# Usage:
+#   python simulate.py --hands 1000000 --workers 8 --seed 42
+# ============================================================================
+
+import argparse
+import contextlib
+import math
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from game import Player, PokerRoom
+
+# Probability knobs for the random driver
+REMOVE_PROBABILITY = 0.02  # Chance per step that a player leaves mid-hand
+JOIN_PROBABILITY = 0.30  # Chance between hands that a new player joins
+MAX_STEPS_PER_HAND = 500  # Guard against a hand that never terminates
+
+# Float tolerance for chip conservation (blinds are fractional)
+CHIP_TOLERANCE = 1e-6
+
+# ============================================================================
+# INVARIANT CHECKING
+# ============================================================================
+
+class InvariantViolation(Exception):
+    """Raised when the room reaches a state that should be impossible."""
+
+
+class Table:
+    """
+    A single simulated table: one PokerRoom plus the bookkeeping needed to
+    check that no chips are created or destroyed.
+    """
+
+    def __init__(self, rng):
+        """
+        Initialize a table with a fresh room.
+
+        Args:
+            rng: random.Random instance driving every choice on this table
+        """
+        self.rng = rng
+        self.next_id = 0
+        self.hand = 0
+        self.step = 0
+        self.total_chips = 0  # Every chip that has ever entered the room
+        self.removed_chips = 0  # Chips carried out by players who left
+        self.folded = set()  # SIDs that folded in the current hand
+        self.room = None
+        self.new_room()
+
+    def new_room(self):
+        """Open a new room with 2-10 players (after the last one closed)."""
+        self.room = PokerRoom("SIM00")
+        self.total_chips = 0
+        self.removed_chips = 0
+        for _ in range(self.rng.randint(2, 10)):
+            self.join()
+
+    def join(self):
+        """Seat a new player with the room's starting stack."""
+        player = Player(f"sid-{self.next_id}", f"P{self.next_id}",
+                        starting_chips=self.room.starting_chips)
+        self.next_id += 1
+        if self.room.add_player(player):
+            self.total_chips += player.chips
+
+    def leave(self):
+        """Remove a random player, as a leave_room or disconnect would."""
+        player = self.rng.choice(self.room.players)
+        self.removed_chips += player.chips
+        self.room.remove_player(player.sid)
+        self.check("remove_player")
+
+    def fail(self, where, message):
+        """Raise an InvariantViolation with enough context to replay it."""
+        raise InvariantViolation(
+            f"[hand {self.hand}, step {self.step}, after {where}] {message}"
+        )
+
+    def check(self, where):
+        """
+        Verify invariants that must hold after every step.
+
+        Args:
+            where: Name of the operation just performed (for the report)
+        """
+        room = self.room
+
+        # Chips are conserved
+        on_table = sum(p.chips for p in room.players) + room.pot
+        if not math.isclose(on_table + self.removed_chips, self.total_chips,
+                            abs_tol=CHIP_TOLERANCE):
+            self.fail(where, f"chips not conserved: {on_table + self.removed_chips:.6f} "
+                             f"!= {self.total_chips:.6f}")
+
+        # Turn index is valid
+        if room.players and not 0 <= room.turn_index < len(room.players):
+            self.fail(where, f"turn_index {room.turn_index} out of range "
+                             f"for {len(room.players)} players")
+
+        # Hand state only references seated players
+        seated = {p.sid for p in room.players}
+        if any(p.sid not in seated for p in room.in_hand):
+            self.fail(where, "in_hand references a player who is not seated")
+        in_hand = {p.sid for p in room.in_hand}
+        if not room.players_to_act <= in_hand:
+            self.fail(where, "players_to_act contains a player not in the hand")
+
+        # A player who folded this hand never comes back into it
+        if self.folded & in_hand:
+            self.fail(where, "a folded player is back in in_hand")
+        if self.folded & room.players_to_act:
+            self.fail(where, "a folded player is in players_to_act")
+        if not room.is_hand_over():
+            current = room.get_current_player()
+            if current is not None and current.sid in self.folded:
+                self.fail(where, f"folded player {current.name} is the current player")
+
+    # ========================================================================
+    # HAND DRIVER (mirrors the handlers in app.py; betting goes through
+    # PokerRoom.apply_action, the same validation the server uses)
+    # ========================================================================
+
+    def start_hand(self):
+        """Start a hand and post blinds, as handle_start_hand does."""
+        room = self.room
+        room.hand_started = True
+        room.show_config = False
+        room.start_hand()
+        self.folded = set()
+        self.check("start_hand")
+
+        sb = room.players[room.small_blind_index]
+        bb = room.players[room.big_blind_index]
+        room.place_bet(sb.sid, room.small_blind_amount)
+        room.place_bet(bb.sid, room.big_blind_amount)
+        self.check("post_blinds")
+
+    def declare_winner(self):
+        """Award any leftover pot to a random player, as the leader would."""
+        room = self.room
+        room.hand_started = False
+        if room.pot == 0 or not room.players:
+            return
+        winner = self.rng.choice(room.in_hand or room.players)
+        winner.chips += room.pot
+        room.pot = 0
+        room.round = "done"
+        self.check("declare_winner")
+
+    def act(self):
+        """
+        Pick a random legal action for the current player and apply it
+        through PokerRoom.apply_action, as handle_action does.
+
+        Returns:
+            str: Result of process_action_and_advance, or None if rejected
+        """
+        room = self.room
+        player = room.get_current_player()
+        if player is None:
+            self.fail("get_current_player", "no current player in a live hand")
+
+        call_amount = room.current_bet - room.bets[player.sid]
+        choices = ["fold", "call"]
+        if room.can_check(player.sid):
+            choices.append("check")
+        if player.chips - call_amount >= 0.01:
+            choices.append("raise")
+        action = self.rng.choice(choices)
+
+        amount = 0
+        if action == "raise":
+            max_raise = player.chips - call_amount
+            amount = max(0.01, math.floor(self.rng.uniform(0.01, max_raise) * 100) / 100)
+
+        result, messages = room.apply_action(player.sid, action, amount)
+        if result is None and action != "raise":
+            # Raises can still be rejected by float rounding; anything else
+            # we picked was legal and must be accepted
+            self.fail(action, f"legal {action} was rejected: {messages[0]}")
+        if result is not None and action == "fold":
+            self.folded.add(player.sid)
+        self.check(action)
+        return result
+
+    def play_hand(self):
+        """Play one complete hand, with random mid-hand departures."""
+        self.hand += 1
+        self.step = 0
+
+        if len(self.room.players) < 2:
+            self.join()
+        self.start_hand()
+
+        while self.step < MAX_STEPS_PER_HAND:
+            self.step += 1
+            if self.rng.random() < REMOVE_PROBABILITY:
+                self.leave()
+                if not self.room.players:
+                    self.new_room()
+                    return
+            if self.room.is_hand_over():
+                break
+            if self.act() == "end_hand":
+                break
+        else:
+            self.fail("play_hand", f"hand did not finish in {MAX_STEPS_PER_HAND} steps")
+
+        self.declare_winner()
+
+        # Between hands: players come and go
+        if self.rng.random() < JOIN_PROBABILITY:
+            self.join()
+
+
+# ============================================================================
+# PROCESS POOL FAN-OUT
+# ============================================================================
+
+def run_batch(seed, hands):
+    """
+    Play a batch of hands on one table (runs inside a worker process).
+
+    Args:
+        seed: Seed for this batch; the same seed replays the same hands
+        hands: Number of hands to play
+
+    Returns:
+        tuple: (seed, hands_played, error message or None)
+    """
+    table = Table(random.Random(seed))
+    try:
+        # game.py prints debug lines on every round; keep workers quiet
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            for _ in range(hands):
+                table.play_hand()
+    except InvariantViolation as e:
+        return seed, table.hand, str(e)
+    except Exception as e:
+        return seed, table.hand, f"[hand {table.hand}, step {table.step}] {type(e).__name__}: {e}"
+    return seed, table.hand, None
+
+
+def simulate(total_hands, workers, base_seed, batch_size):
+    """
+    Fan hands out across a process pool and collect any failures.
+
+    Args:
+        total_hands: Total number of hands to play
+        workers: Number of worker processes
+        base_seed: Batch i is seeded with base_seed + i
+        batch_size: Hands per batch (one table per batch)
+
+    Returns:
+        list: (seed, hand, message) for every failing batch
+    """
+    batches = []
+    remaining = total_hands
+    while remaining > 0:
+        batches.append(min(batch_size, remaining))
+        remaining -= batch_size
+    seeds = [base_seed + i for i in range(len(batches))]
+
+    failures = []
+    played = 0
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for seed, hands, error in pool.map(run_batch, seeds, batches, chunksize=4):
+            played += hands
+            if error:
+                failures.append((seed, hands, error))
+                print(f"FAIL seed={seed}: {error}")
+    print(f"Played {played} hands across {len(batches)} tables")
+    return failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Fuzz PokerRoom with random legal hands.")
+    parser.add_argument("--hands", type=int, default=100000, help="total hands to play")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="worker processes")
+    parser.add_argument("--seed", type=int, default=0, help="base seed (batch i uses seed + i)")
+    parser.add_argument("--batch", type=int, default=1000, help="hands per batch")
+    parser.add_argument("--replay", type=int, help="replay a single batch seed in-process")
+    args = parser.parse_args(argv)
+
+    if args.replay is not None:
+        seed, hands, error = run_batch(args.replay, args.batch)
+        print(error or f"Seed {seed}: {hands} hands OK")
+        return 1 if error else 0
+
+    start = time.perf_counter()
+    failures = simulate(args.hands, args.workers, args.seed, args.batch)
+    elapsed = time.perf_counter() - start
+    print(f"{len(failures)} failing tables in {elapsed:.1f}s "
+          f"({args.hands / elapsed:,.0f} hands/s)")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,175 @@
+# ============================================================================
+# POKER CHIP TRACKER - STATIC ASSET CACHE
+# Loads the page and built frontend into memory once at startup,
+# precompresses them (gzip + brotli) and serves them with strong ETags.
+# ============================================================================
+
+import gzip
+import hashlib
+import mimetypes
+import os
+
+from flask import Response, request
+
+try:
+    import brotli  # Optional: pip install brotli
+except ImportError:
+    brotli = None
+
+# Vite puts content-hashed bundles here, so they can be cached forever
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+# Unhashed files (HTML pages) must be revalidated with their ETag
+REVALIDATE_CACHE_CONTROL = "no-cache"
+
+# Don't bother compressing tiny files or formats that are already compressed
+MIN_COMPRESS_SIZE = 256
+COMPRESSIBLE_TYPES = ("text/", "application/javascript", "application/json",
+                      "image/svg+xml", "application/xml")
+
+# ============================================================================
+# CACHED ASSET
+# ============================================================================
+
+class StaticAsset:
+    """
+    One file held in memory with its precompressed variants.
+    Each encoding gets its own strong ETag since the bytes differ.
+    """
+
+    def __init__(self, body, content_type, cache_control):
+        """
+        Compress the body once and compute ETags.
+
+        Args:
+            body: Raw file bytes
+            content_type: MIME type sent in Content-Type
+            cache_control: Value for the Cache-Control header
+        """
+        self.content_type = content_type
+        self.cache_control = cache_control
+
+        digest = hashlib.sha256(body).hexdigest()[:32]
+        self.variants = {None: (body, digest)}  # {encoding: (bytes, etag)}
+
+        if len(body) >= MIN_COMPRESS_SIZE and content_type.startswith(COMPRESSIBLE_TYPES):
+            compressed = gzip.compress(body, compresslevel=9, mtime=0)
+            if len(compressed) < len(body):
+                self.variants["gzip"] = (compressed, f"{digest}-gz")
+            if brotli is not None:
+                compressed = brotli.compress(body, quality=11)
+                if len(compressed) < len(body):
+                    self.variants["br"] = (compressed, f"{digest}-br")
+
+    def pick_encoding(self):
+        """
+        Choose the best variant the client accepts (brotli, gzip, identity).
+
+        Returns:
+            str: Encoding name, or None for the uncompressed body
+        """
+        for encoding in ("br", "gzip"):
+            if encoding in self.variants and request.accept_encodings[encoding]:
+                return encoding
+        return None
+
+    def response(self):
+        """
+        Build a response for the current request (200, or 304 if the
+        client's If-None-Match holds the ETag of the variant being served).
+
+        Returns:
+            Response: Flask response object
+        """
+        encoding = self.pick_encoding()
+        body, etag = self.variants[encoding]
+
+        # Only the variant actually being served counts (each encoding has
+        # its own ETag); "*" matches any current representation
+        if_none_match = request.if_none_match
+        if if_none_match.star_tag or if_none_match.contains_weak(etag):
+            response = Response(status=304)
+        else:
+            response = Response(body, content_type=self.content_type)
+            if encoding:
+                response.headers["Content-Encoding"] = encoding
+
+        response.set_etag(etag)
+        response.headers["Cache-Control"] = self.cache_control
+        response.headers["Vary"] = "Accept-Encoding"
+        return response
+
+# ============================================================================
+# ASSET REGISTRY
+# ============================================================================
+
+class StaticCache:
+    """
+    Maps URL paths to in-memory StaticAssets.
+    Everything is read and compressed when registered, never per request.
+    """
+
+    def __init__(self):
+        """Initialize an empty cache."""
+        self.assets = {}  # {url_path: StaticAsset}
+
+    def add_file(self, url_path, file_path, immutable=False):
+        """
+        Load a single file into the cache.
+
+        Args:
+            url_path: Path the file is served at (e.g. "/")
+            file_path: File on disk
+            immutable: True for content-hashed files that never change
+
+        Returns:
+            bool: True if loaded, False if the file doesn't exist
+        """
+        if not os.path.isfile(file_path):
+            return False
+
+        with open(file_path, "rb") as f:
+            body = f.read()
+
+        content_type = mimetypes.guess_type(file_path)[0] or "application/octet-stream"
+        if content_type.startswith("text/") or content_type == "application/javascript":
+            content_type += "; charset=utf-8"
+
+        cache_control = IMMUTABLE_CACHE_CONTROL if immutable else REVALIDATE_CACHE_CONTROL
+        self.assets[url_path] = StaticAsset(body, content_type, cache_control)
+        return True
+
+    def add_directory(self, url_prefix, directory, immutable=False):
+        """
+        Load every file under a directory (recursively).
+
+        Args:
+            url_prefix: URL path the directory is mounted at (e.g. "/assets")
+            directory: Directory on disk (skipped if missing, e.g. frontend not built)
+            immutable: True for content-hashed build output
+
+        Returns:
+            int: Number of files loaded
+        """
+        count = 0
+        for root, _, files in os.walk(directory):
+            for name in files:
+                file_path = os.path.join(root, name)
+                relative = os.path.relpath(file_path, directory).replace(os.sep, "/")
+                if self.add_file(f"{url_prefix.rstrip('/')}/{relative}", file_path, immutable):
+                    count += 1
+        return count
+
+    def response(self, url_path):
+        """
+        Serve a cached path.
+
+        Args:
+            url_path: Requested URL path
+
+        Returns:
+            Response: Flask response, or None if the path isn't cached
+        """
+        asset = self.assets.get(url_path)
+        if asset is None:
+            return None
+        return asset.response()
@@ -0,0 +1,433 @@
+# ============================================================================
+# POKER CHIP TRACKER - ROOM STORE
+# Pluggable room storage: in-memory, SQLite (WAL) or any Redis-protocol
+# server. Live rooms are served from an in-memory read-through cache and
+# changes are persisted by a batched write-behind thread.
+#
+# Configure with a URL:
+#   memory://                  (default, nothing persisted)
+#   sqlite:///rooms.db         (file path after the third slash)
+#   redis://localhost:6379/0
+# ============================================================================
+
+import atexit
+import json
+import socket
+import sqlite3
+import threading
+import time
+from urllib.parse import urlparse
+
+from game import PokerRoom
+
+# Default upper bound (seconds) on how far durable state trails live state
+DEFAULT_MAX_LAG = 0.5
+
+# Flush early once this many rooms are waiting to be written
+DEFAULT_BATCH_SIZE = 100
+
+# Rooms untouched for this many seconds expire from durable storage
+DEFAULT_ROOM_TTL = 24 * 60 * 60
+
+# Minimum seconds between SQLite sweeps of expired rooms
+SWEEP_INTERVAL = 60
+
+# ============================================================================
+# BACKENDS
+# Each backend stores JSON strings by room code and must implement:
+#   read(code) -> str or None
+#   write_many({code: str or None})   (None deletes the room)
+#   close()
+# ============================================================================
+
+class MemoryBackend:
+    """No durable storage: rooms only live in the store's cache."""
+
+    def read(self, code):
+        return None
+
+    def write_many(self, changes):
+        pass
+
+    def close(self):
+        pass
+
+
+class SQLiteBackend:
+    """
+    Stores rooms in a single SQLite table using write-ahead logging,
+    so readers never block the write-behind thread (and vice versa).
+    Rows older than the TTL are ignored on read and swept on write.
+    """
+
+    def __init__(self, path, ttl=DEFAULT_ROOM_TTL):
+        """
+        Open (or create) the database.
+
+        Args:
+            path: Database file path
+            ttl: Seconds since its last write before a room expires (None: never)
+        """
+        self.ttl = ttl
+        self.next_sweep = 0
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("CREATE TABLE IF NOT EXISTS rooms (code TEXT PRIMARY KEY, state TEXT NOT NULL, "
+                          "updated_at REAL NOT NULL DEFAULT 0)")
+
+        # Databases from before expiry: add the column, timestamping old rows now
+        columns = [row[1] for row in self.conn.execute("PRAGMA table_info(rooms)")]
+        if "updated_at" not in columns:
+            self.conn.execute("ALTER TABLE rooms ADD COLUMN updated_at REAL NOT NULL DEFAULT 0")
+            self.conn.execute("UPDATE rooms SET updated_at = ?", (time.time(),))
+        self.conn.execute("CREATE INDEX IF NOT EXISTS rooms_updated_at ON rooms (updated_at)")
+
+    def _cutoff(self):
+        """Helper: rows last written before this timestamp have expired."""
+        return time.time() - self.ttl if self.ttl else float("-inf")
+
+    def read(self, code):
+        with self.lock:
+            row = self.conn.execute("SELECT state FROM rooms WHERE code = ? AND updated_at >= ?",
+                                    (code, self._cutoff())).fetchone()
+        return row[0] if row else None
+
+    def write_many(self, changes):
+        """Apply a whole batch of upserts/deletes in one transaction."""
+        now = time.time()
+        upserts = [(code, state, now) for code, state in changes.items() if state is not None]
+        deletes = [(code,) for code, state in changes.items() if state is None]
+        with self.lock:
+            self.conn.execute("BEGIN")
+            try:
+                self.conn.executemany(
+                    "INSERT INTO rooms (code, state, updated_at) VALUES (?, ?, ?) "
+                    "ON CONFLICT(code) DO UPDATE SET state = excluded.state, "
+                    "updated_at = excluded.updated_at", upserts)
+                self.conn.executemany("DELETE FROM rooms WHERE code = ?", deletes)
+                if self.ttl and now >= self.next_sweep:
+                    self.conn.execute("DELETE FROM rooms WHERE updated_at < ?", (self._cutoff(),))
+            except Exception:
+                self.conn.execute("ROLLBACK")
+                raise
+            self.conn.execute("COMMIT")
+            if self.ttl and now >= self.next_sweep:
+                self.next_sweep = now + SWEEP_INTERVAL
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+
+class RedisBackend:
+    """
+    Minimal Redis client speaking RESP over a plain socket (no extra
+    dependency). Works with Redis, Valkey, KeyDB or any local stand-in
+    that implements GET/SET/DEL/SELECT. Batches are pipelined and rooms
+    are written with an expiry, so abandoned rooms clean themselves up.
+    """
+
+    def __init__(self, host="localhost", port=6379, db=0, prefix="room:", ttl=DEFAULT_ROOM_TTL):
+        """
+        Connect to the server.
+
+        Args:
+            host: Server hostname
+            port: Server port
+            db: Database number (sent with SELECT when non-zero)
+            prefix: Key prefix for room entries
+            ttl: Seconds since its last write before a room expires (None: never)
+        """
+        self.address = (host, port)
+        self.ttl = ttl
+        self.db = db
+        self.prefix = prefix
+        self.lock = threading.Lock()
+        self.sock = None
+        self.reader = None
+        with self.lock:
+            self._connect()
+
+    def _connect(self):
+        """Helper: open the socket and select the database (lock held)."""
+        self.sock = socket.create_connection(self.address)
+        self.reader = self.sock.makefile("rb")
+        if self.db:
+            self._send([("SELECT", str(self.db))])
+
+    def _disconnect(self):
+        """Helper: drop a broken connection so the next call reconnects (lock held)."""
+        for conn in (self.reader, self.sock):
+            if conn is not None:
+                try:
+                    conn.close()
+                except OSError:
+                    pass
+        self.sock = None
+        self.reader = None
+
+    @staticmethod
+    def _encode(args):
+        """Helper: encode one command as a RESP array of bulk strings."""
+        out = [b"*%d\r\n" % len(args)]
+        for arg in args:
+            data = arg.encode() if isinstance(arg, str) else arg
+            out.append(b"$%d\r\n%s\r\n" % (len(data), data))
+        return b"".join(out)
+
+    def _read_reply(self):
+        """
+        Helper: read one RESP reply.
+        Error replies are returned (not raised) so the rest of a pipeline
+        is still read and the connection stays in sync.
+        """
+        line = self.reader.readline()
+        if not line:
+            raise ConnectionError("Redis connection closed")
+        kind, payload = line[:1], line[1:-2]
+        if kind == b"+":
+            return payload.decode()
+        if kind == b"-":
+            return RuntimeError(f"Redis error: {payload.decode()}")
+        if kind == b":":
+            return int(payload)
+        if kind == b"$":
+            length = int(payload)
+            if length == -1:
+                return None
+            data = self.reader.read(length + 2)[:-2]
+            return data.decode()
+        if kind == b"*":
+            length = int(payload)
+            return None if length == -1 else [self._read_reply() for _ in range(length)]
+        raise ConnectionError(f"Unexpected Redis reply: {line!r}")
+
+    def _send(self, commands):
+        """Helper: pipeline commands on the open connection (lock held)."""
+        self.sock.sendall(b"".join(self._encode(c) for c in commands))
+        replies = [self._read_reply() for _ in commands]
+        for reply in replies:
+            if isinstance(reply, RuntimeError):
+                raise reply
+        return replies
+
+    def _execute(self, commands):
+        """
+        Helper: pipeline several commands and return their replies.
+        On a connection error, reconnects and retries once (GET/SET/DEL
+        are safe to repeat); if that fails too the error is raised and the
+        next call tries again.
+        """
+        with self.lock:
+            for attempt in range(2):
+                try:
+                    if self.sock is None:
+                        self._connect()
+                    return self._send(commands)
+                except (OSError, ConnectionError):
+                    self._disconnect()
+                    if attempt:
+                        raise
+
+    def read(self, code):
+        return self._execute([("GET", self.prefix + code)])[0]
+
+    def write_many(self, changes):
+        expiry = ("EX", str(int(self.ttl))) if self.ttl else ()
+        commands = [("SET", self.prefix + code, state, *expiry) if state is not None
+                    else ("DEL", self.prefix + code)
+                    for code, state in changes.items()]
+        if commands:
+            self._execute(commands)
+
+    def close(self):
+        with self.lock:
+            self._disconnect()
+
+# ============================================================================
+# ROOM STORE
+# ============================================================================
+
+class RoomStore:
+    """
+    Dict-like room storage used by the server.
+    Reads hit the in-memory cache first and fall back to the backend.
+    Writes only mark a room dirty; a background thread writes dirty rooms
+    in batches, so repeated updates to one room collapse into one write.
+    """
+
+    def __init__(self, backend=None, max_lag=DEFAULT_MAX_LAG, batch_size=DEFAULT_BATCH_SIZE):
+        """
+        Initialize the store and start the write-behind thread.
+
+        Args:
+            backend: Storage backend (default: MemoryBackend)
+            max_lag: Max seconds between a change and its durable write
+            batch_size: Flush early when this many rooms are dirty
+        """
+        self.backend = backend or MemoryBackend()
+        self.max_lag = max_lag
+        self.batch_size = batch_size
+
+        self.cache = {}  # {room_code: PokerRoom} live rooms
+        self.pending = {}  # {room_code: JSON state, or None for delete}
+        self.inflight = {}  # Batch currently being written by flush()
+        self.lock = threading.Lock()
+        self.wakeup = threading.Condition(self.lock)
+        self.closed = False
+
+        self.persistent = not isinstance(self.backend, MemoryBackend)
+        if self.persistent:
+            self.thread = threading.Thread(target=self._flush_loop, name="room-store-flush", daemon=True)
+            self.thread.start()
+            atexit.register(self.close)
+
+    # ========================================================================
+    # DICT INTERFACE
+    # ========================================================================
+
+    def get(self, code, default=None):
+        """
+        Look up a room, loading it from the backend on a cache miss.
+
+        Args:
+            code: Room code
+            default: Returned if the room doesn't exist
+
+        Returns:
+            PokerRoom: The room, or default
+        """
+        room = self.cache.get(code)
+        if room is not None or not self.persistent:
+            return room if room is not None else default
+
+        with self.lock:
+            # Newest state, even if not yet written
+            queued = code in self.pending or code in self.inflight
+            state = self.pending[code] if code in self.pending else self.inflight.get(code)
+        if not queued:
+            state = self.backend.read(code)
+        if state is None:
+            return default
+
+        room = PokerRoom.from_dict(json.loads(state))
+        return self.cache.setdefault(code, room)
+
+    def __getitem__(self, code):
+        room = self.get(code)
+        if room is None:
+            raise KeyError(code)
+        return room
+
+    def __contains__(self, code):
+        return self.get(code) is not None
+
+    def __setitem__(self, code, room):
+        self.cache[code] = room
+        self.save(room)
+
+    def __delitem__(self, code):
+        del self.cache[code]
+        self._enqueue(code, None)
+
+    def items(self):
+        """Live (cached) rooms, as (code, room) pairs."""
+        return self.cache.items()
+
+    # ========================================================================
+    # WRITE-BEHIND
+    # ========================================================================
+
+    def save(self, room):
+        """
+        Mark a room as changed. Returns immediately; the write happens
+        on the background thread within max_lag seconds.
+
+        Args:
+            room: PokerRoom whose state changed
+        """
+        if self.persistent:
+            self._enqueue(room.code, json.dumps(room.to_dict()))
+
+    def _enqueue(self, code, state):
+        """Helper: record the latest state for a room (overwrites older ones)."""
+        if not self.persistent:
+            return
+        with self.lock:
+            self.pending[code] = state
+            if len(self.pending) >= self.batch_size:
+                self.wakeup.notify()
+
+    def flush(self):
+        """
+        Write every pending change to the backend now.
+        If the write fails, the batch is put back (behind any newer changes)
+        so the next flush retries it, and the error is raised.
+        """
+        with self.lock:
+            batch, self.pending = self.pending, {}
+            self.inflight = batch
+        if not batch:
+            return
+        try:
+            self.backend.write_many(batch)
+        except Exception:
+            with self.lock:
+                self.pending = {**batch, **self.pending}
+            raise
+        finally:
+            with self.lock:
+                self.inflight = {}
+
+    def _flush_loop(self):
+        """Background thread: flush at least every max_lag seconds."""
+        while True:
+            with self.lock:
+                if not self.closed and len(self.pending) < self.batch_size:
+                    self.wakeup.wait(self.max_lag)
+                if self.closed:
+                    return
+            try:
+                self.flush()
+            except Exception as e:
+                print("ROOM STORE FLUSH FAILED:", e)
+                time.sleep(self.max_lag)
+
+    def close(self):
+        """Stop the write-behind thread, write remaining changes, close backend."""
+        if self.closed:
+            return
+        with self.lock:
+            self.closed = True
+            self.wakeup.notify()
+        if self.persistent:
+            self.thread.join()
+            self.flush()
+        self.backend.close()
+
+
+def open_store(url="memory://", max_lag=DEFAULT_MAX_LAG, ttl=DEFAULT_ROOM_TTL):
+    """
+    Create a RoomStore from a URL.
+
+    Args:
+        url: memory://, sqlite:///path/to/file.db or redis://host:port/db
+        max_lag: Max seconds durable state may trail live state
+        ttl: Seconds an untouched room is kept in durable storage (None: forever)
+
+    Returns:
+        RoomStore: Configured store
+    """
+    parsed = urlparse(url)
+    if parsed.scheme in ("", "memory"):
+        backend = MemoryBackend()
+    elif parsed.scheme == "sqlite":
+        backend = SQLiteBackend(parsed.path[1:] or "rooms.db", ttl=ttl)
+    elif parsed.scheme == "redis":
+        db = int(parsed.path[1:] or 0)
+        backend = RedisBackend(parsed.hostname or "localhost", parsed.port or 6379, db, ttl=ttl)
+    else:
+        raise ValueError(f"Unknown room store: {url}")
+    return RoomStore(backend, max_lag=max_lag)
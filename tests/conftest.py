@@ -0,0 +1,124 @@
+# ============================================================================
+# POKER CHIP TRACKER - TEST FIXTURES
+# ============================================================================
+
+import os
+import socketserver
+import sys
+import threading
+
+import pytest
+
+# Tests import the top-level modules (game, store, ...) directly
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# ============================================================================
+# IN-PROCESS REDIS STAND-IN
+# ============================================================================
+
+class RespStub(socketserver.ThreadingTCPServer):
+    """
+    Tiny Redis-protocol server supporting GET/SET/DEL/SELECT.
+    Records every command received so tests can check pipelining.
+    """
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), RespHandler)
+        self.dbs = {}  # {db_number: {key: value}}
+        self.commands = []  # (db_number, command, args...) in arrival order
+        self.connections = []
+
+    def drop_connections(self):
+        """Close every client connection (simulates a server restart)."""
+        for conn in self.connections:
+            conn.close()
+        self.connections.clear()
+
+
+class RespHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        self.server.connections.append(self.connection)
+        db = 0
+        while True:
+            try:
+                line = self.rfile.readline()
+            except OSError:
+                return
+            if not line:
+                return
+            args = []
+            for _ in range(int(line[1:])):
+                length = int(self.rfile.readline()[1:])
+                args.append(self.rfile.read(length + 2)[:-2].decode())
+
+            command = args[0].upper()
+            self.server.commands.append((db, command, *args[1:]))
+            data = self.server.dbs.setdefault(db, {})
+            if command == "SELECT":
+                db = int(args[1])
+                reply = b"+OK\r\n"
+            elif command == "SET":
+                data[args[1]] = args[2]
+                reply = b"+OK\r\n"
+            elif command == "GET":
+                value = data.get(args[1])
+                reply = b"$-1\r\n" if value is None else b"$%d\r\n%s\r\n" % (len(value.encode()), value.encode())
+            elif command == "DEL":
+                reply = b":%d\r\n" % (data.pop(args[1], None) is not None)
+            else:
+                reply = b"-ERR unknown command '%s'\r\n" % command.encode()
+            self.wfile.write(reply)
+
+
+@pytest.fixture
+def resp_stub():
+    """A running RespStub; yields the server (address in .server_address)."""
+    server = RespStub()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+# ============================================================================
+# SERVER
+# ============================================================================
+
+@pytest.fixture
+def make_app(tmp_path):
+    """
+    Factory fixture: build a fresh server app (memory store, empty frontend
+    dist under tmp_path unless overridden).
+    """
+    import app as server
+
+    def build(**config):
+        config.setdefault("FRONTEND_DIST", str(tmp_path / "dist"))
+        return server.create_app(config)
+
+    return build
+
+
+@pytest.fixture
+def sio(make_app):
+    """
+    A fresh app plus a helper that opens Socket.IO test clients on it.
+    Yields (flask_app, connect) where connect() returns a new client.
+    """
+    import app as server
+
+    flask_app = make_app()
+    clients = []
+
+    def connect():
+        client = server.socketio.test_client(flask_app)
+        clients.append(client)
+        return client
+
+    yield flask_app, connect
+    for client in clients:
+        if client.is_connected():
+            client.disconnect()
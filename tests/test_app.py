@@ -0,0 +1,365 @@
+import pytest
+
+from test_history import state
+
+NAMES = ("Alice", "Bob", "Carol")
+
+
+def received(client, event):
+    """Payloads of every `event` the client has received since the last call."""
+    return [m["args"][0] for m in client.get_received() if m["name"] == event]
+
+
+def seat_table(connect, names=NAMES):
+    """Open one client per name; the first creates the room, the rest join."""
+    clients = [connect() for _ in names]
+    clients[0].emit("create_room", {"name": names[0]})
+    code = received(clients[0], "room_created")[0]["code"]
+    for client, name in zip(clients[1:], names[1:]):
+        client.emit("join_room", {"name": name, "room": code})
+    for client in clients:
+        client.get_received()
+    return code, clients
+
+
+# ============================================================================
+# ROOM STATE BROADCASTS
+# ============================================================================
+
+def test_room_update_is_public_and_overlays_are_per_seat(sio):
+    flask_app, connect = sio
+    code, clients = seat_table(connect)
+
+    clients[0].emit("start_hand", {"code": code})
+
+    for seat, client in enumerate(clients):
+        messages = client.get_received()
+        updates = [m["args"][0] for m in messages if m["name"] == "room_update"]
+        overlays = [m["args"][0] for m in messages if m["name"] == "room_private"]
+
+        assert len(updates) == 1 and len(overlays) == 1
+        update, overlay = updates[0], overlays[0]
+        assert "leader_sid" not in update
+        assert overlay["version"] == update["version"]
+        assert overlay["seat"] == seat
+        assert update["players"][overlay["seat"]]["name"] == NAMES[seat]
+        assert overlay["is_leader"] == (seat == 0)
+        assert overlay["in_hand"]
+
+    # Exactly one seat is told it is their turn
+    room = flask_app.extensions["rooms"][code]
+    assert [room.serialize_private(p.sid)["is_turn"] for p in room.players].count(True) == 1
+
+
+# ============================================================================
+# UNDO / REDO
+# ============================================================================
+
+def test_undo_declare_winner_returns_the_pot(sio):
+    flask_app, connect = sio
+    code, clients = seat_table(connect)
+    room = flask_app.extensions["rooms"][code]
+    leader = clients[0]
+
+    leader.emit("start_hand", {"code": code})
+    before = state(room)
+    leader.emit("declare_winner", {"room": code, "winner": "Bob"})
+    assert room.pot == 0 and not room.hand_started
+
+    leader.emit("undo", {"room": code})
+    assert state(room) == before
+    leader.emit("redo", {"room": code})
+    assert room.pot == 0 and room.players[1].chips > room.starting_chips
+
+
+def test_undo_configure_game(sio):
+    flask_app, connect = sio
+    code, clients = seat_table(connect)
+    room = flask_app.extensions["rooms"][code]
+    before = state(room)
+
+    clients[0].emit("configure_game", {"room": code, "starting_chips": 50,
+                                       "small_blind": 0.5, "big_blind": 1})
+    assert room.starting_chips == 50
+
+    clients[0].emit("undo", {"room": code})
+    assert state(room) == before
+
+
+def test_only_leader_can_undo(sio):
+    flask_app, connect = sio
+    code, clients = seat_table(connect)
+    clients[0].emit("start_hand", {"code": code})
+    clients[0].get_received()
+
+    clients[1].emit("undo", {"room": code})
+    assert received(clients[1], "error") == [{"message": "Only the room leader can undo actions"}]
+    assert flask_app.extensions["rooms"][code].hand_started
+
+
+# ============================================================================
+# RESTART RECOVERY
+# ============================================================================
+
+def test_players_reclaim_their_seats_after_a_restart(make_app, tmp_path):
+    import app as server
+
+    url = f"sqlite:///{tmp_path / 'rooms.db'}"
+    first = make_app(ROOM_STORE=url)
+
+    def connect_to(flask_app):
+        return server.socketio.test_client(flask_app)
+
+    code, old_clients = seat_table(lambda: connect_to(first))
+    old_clients[0].emit("start_hand", {"code": code})
+    before = state(first.extensions["rooms"][code])
+    first.extensions["rooms"].close()  # Server goes away; sockets die with it
+
+    second = make_app(ROOM_STORE=url)
+    room = second.extensions["rooms"][code]
+    assert not room.has_connected_players()
+
+    # Bob comes back first and leads until Alice (the old leader) returns
+    bob = connect_to(second)
+    bob.emit("join_room", {"name": "Bob", "room": code})
+    assert [p.name for p in room.players] == list(NAMES)
+    assert room.leader_sid == room.players[1].sid
+    overlay = received(bob, "room_private")[-1]
+    assert overlay["seat"] == 1 and overlay["is_leader"]
+
+    alice = connect_to(second)
+    alice.emit("join_room", {"name": "Alice", "room": code})
+    assert [p.connected for p in room.players] == [True, True, False]
+    assert [p.chips for p in room.players] == [p[2] for p in before["players"]]
+    assert room.pot == before["pot"]
+
+    # A newcomer gets a fresh seat instead of Carol's
+    dave = connect_to(second)
+    dave.emit("join_room", {"name": "Dave", "room": code})
+    assert [p.name for p in room.players] == [*NAMES, "Dave"]
+
+    # Once every connected player is gone, the unreclaimed seat doesn't keep the room
+    for client in (bob, alice, dave):
+        client.disconnect()
+    assert code not in second.extensions["rooms"]
+    second.extensions["rooms"].close()
+    third = make_app(ROOM_STORE=url)
+    assert code not in third.extensions["rooms"]
+    third.extensions["rooms"].close()
+
+
+# ============================================================================
+# ACTION BATCHES
+# ============================================================================
+
+def start_hand(flask_app, code, clients):
+    """Start a hand as the leader; returns the room and names in turn order."""
+    clients[0].emit("start_hand", {"code": code})
+    for client in clients:
+        client.get_received()
+    room = flask_app.extensions["rooms"][code]
+    n = len(room.players)
+    order = [room.players[(room.turn_index + i) % n].name for i in range(n)]
+    return room, order
+
+
+def test_leader_batch_for_other_players(sio):
+    flask_app, connect = sio
+    code, clients = seat_table(connect)
+    room, order = start_hand(flask_app, code, clients)
+
+    clients[0].emit("actions_batch", {"room": code, "actions": [
+        {"action": "call", "player": order[0]},
+        {"action": "fold", "player": order[1]},
+    ]})
+
+    assert received(clients[0], "error") == []
+    assert [p.name for p in room.in_hand] == [n for n in NAMES if n != order[1]]
+    assert len(room.history.undo_stack) == 2  # start_hand, then the whole batch
+
+
+def test_batch_stops_at_the_end_of_a_hand(sio):
+    flask_app, connect = sio
+    code, clients = seat_table(connect)
+    room, order = start_hand(flask_app, code, clients)
+    before = state(room)
+
+    clients[0].emit("actions_batch", {"room": code, "actions": [
+        {"action": "fold", "player": order[0]},
+        {"action": "fold", "player": order[1]},
+        {"action": "check", "player": order[2]},
+    ]})
+
+    assert received(clients[0], "error") == [{"message": "Batch rejected at action 3: The hand is already over. No actions were applied."}]
+    assert state(room) == before
+    assert received(clients[1], "hand_over") == []
+
+
+def test_batch_reports_the_hand_result(sio):
+    flask_app, connect = sio
+    code, clients = seat_table(connect)
+    room, order = start_hand(flask_app, code, clients)
+    pot = room.pot
+
+    clients[0].emit("actions_batch", {"room": code, "actions": [
+        {"action": "fold", "player": order[0]},
+        {"action": "fold", "player": order[1]},
+    ]})
+
+    assert received(clients[1], "hand_over") == [{"winner": order[2], "pot": pot}]
+
+
+def test_rejected_action_rolls_back_the_batch(sio):
+    flask_app, connect = sio
+    code, clients = seat_table(connect)
+    room, order = start_hand(flask_app, code, clients)
+    before = state(room)
+
+    clients[0].emit("actions_batch", {"room": code, "actions": [
+        {"action": "call", "player": order[0]},
+        {"action": "raise", "amount": 10_000, "player": order[1]},
+    ]})
+
+    [error] = received(clients[0], "error")
+    assert error["message"].startswith("Batch rejected at action 2:")
+    assert state(room) == before
+    assert received(clients[1], "room_update") == []
+
+
+def test_exception_rolls_back_the_batch(sio, monkeypatch):
+    flask_app, connect = sio
+    code, clients = seat_table(connect)
+    room, order = start_hand(flask_app, code, clients)
+    before = state(room)
+
+    apply_action = room.apply_action
+    calls = []
+
+    def explode_on_second(*args):
+        calls.append(args)
+        if len(calls) == 2:
+            raise ZeroDivisionError("boom")
+        return apply_action(*args)
+
+    monkeypatch.setattr(room, "apply_action", explode_on_second)
+    clients[0].emit("actions_batch", {"room": code, "actions": [
+        {"action": "call", "player": order[0]},
+        {"action": "call", "player": order[1]},
+    ]})
+
+    assert received(clients[0], "error") == [{"message": "Batch failed on the server. No actions were applied."}]
+    assert state(room) == before
+
+
+@pytest.mark.parametrize("actions", [
+    [],
+    "fold",
+    [{"action": "fold"}] * 501,
+    ["fold"],
+    [{"amount": 1}],
+    [{"action": "raise", "amount": "1"}],
+    [{"action": "raise", "amount": True}],
+    [{"action": "fold", "player": 3}],
+])
+def test_malformed_batches_are_refused(sio, actions):
+    flask_app, connect = sio
+    code, clients = seat_table(connect)
+    room, _ = start_hand(flask_app, code, clients)
+    before = state(room)
+
+    clients[0].emit("actions_batch", {"room": code, "actions": actions})
+
+    [error] = received(clients[0], "error")
+    assert "No actions were applied" in error["message"] or "1-500" in error["message"]
+    assert state(room) == before
+
+
+def test_non_leader_cannot_act_for_others(sio):
+    flask_app, connect = sio
+    code, clients = seat_table(connect)
+    room, order = start_hand(flask_app, code, clients)
+    before = state(room)
+    # Neither the leader nor the player on the clock
+    outsider = clients[NAMES.index(next(n for n in order[1:] if n != NAMES[0]))]
+
+    outsider.emit("actions_batch", {"room": code, "actions": [{"action": "fold", "player": order[0]}]})
+
+    assert received(outsider, "error") == [{"message": "Batch rejected at action 1: Only the room leader can submit actions for other players. No actions were applied."}]
+    assert state(room) == before
+
+
+# ============================================================================
+# SINGLE ACTIONS
+# ============================================================================
+
+def test_rejected_action_is_only_told_to_the_sender(sio):
+    flask_app, connect = sio
+    code, clients = seat_table(connect)
+    room, order = start_hand(flask_app, code, clients)
+    waiting = clients[NAMES.index(order[1])]
+
+    waiting.emit("action", {"room": code, "action": "fold"})
+
+    assert received(waiting, "error") == [{"message": "Not your turn!"}]
+    for client in clients:
+        assert received(client, "action_log") == []
+
+
+def test_accepted_action_is_broadcast(sio):
+    flask_app, connect = sio
+    code, clients = seat_table(connect)
+    room, order = start_hand(flask_app, code, clients)
+
+    clients[NAMES.index(order[0])].emit("action", {"room": code, "action": "fold"})
+
+    for client in clients:
+        assert received(client, "action_log") == [{"message": f"{order[0]} folds"}]
+
+
+# ============================================================================
+# LEAVING AND CONNECTING
+# ============================================================================
+
+def test_leaving_stops_room_broadcasts(sio):
+    flask_app, connect = sio
+    code, clients = seat_table(connect)
+    leaver = clients[2]
+
+    leaver.emit("leave_room", {"room": code})
+    leaver.get_received()
+    clients[0].emit("start_hand", {"code": code})
+
+    assert leaver.get_received() == []
+    assert [p.name for p in flask_app.extensions["rooms"][code].players] == list(NAMES[:2])
+
+
+def test_last_player_leaving_closes_the_room(sio):
+    flask_app, connect = sio
+    code, clients = seat_table(connect, names=("Alice",))
+    other = connect()
+
+    clients[0].emit("leave_room", {"room": code})
+
+    assert code not in flask_app.extensions["rooms"]
+    assert received(clients[0], "action_log") == [{"message": f"Room {code} has been closed as the last player left."}]
+    assert other.get_received() == []
+
+
+def test_connections_are_limited_per_ip(make_app):
+    import app as server
+
+    flask_app = make_app()
+    http = flask_app.test_client()
+    http.environ_base["REMOTE_ADDR"] = "203.0.113.7"
+    _, burst = server.RATE_LIMITS["connect"]
+
+    clients = [server.socketio.test_client(flask_app, flask_test_client=http)
+               for _ in range(burst * flask_app.extensions["rate_limiter"].ip_multiplier + 1)]
+
+    assert [c.is_connected() for c in clients].count(False) == 1
+    assert not clients[-1].is_connected()
+
+    # Other addresses are unaffected
+    neighbour = flask_app.test_client()
+    neighbour.environ_base["REMOTE_ADDR"] = "203.0.113.8"
+    assert server.socketio.test_client(flask_app, flask_test_client=neighbour).is_connected()
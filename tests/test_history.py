@@ -0,0 +1,99 @@
+import json
+
+from game import UNDO_LIMIT, Player, PokerRoom
+
+
+def make_room(*names):
+    """A room with one seat per name and a hand in progress (blinds posted)."""
+    room = PokerRoom("UNDO1", leader_sid="sid-0")
+    for i, name in enumerate(names):
+        room.add_player(Player(f"sid-{i}", name, starting_chips=room.starting_chips))
+    room.hand_started = True
+    room.start_hand()
+    room.place_bet(room.players[room.small_blind_index].sid, room.small_blind_amount)
+    room.place_bet(room.players[room.big_blind_index].sid, room.big_blind_amount)
+    return room
+
+
+def state(room):
+    """Game state as plain JSON (to_dict() shares the room's live containers)."""
+    state = json.loads(json.dumps(room.to_dict()))
+    del state["version"]  # Broadcast counter, moves forward on undo too
+    return state
+
+
+def act(room, action, amount=0):
+    """Apply an action for the current player, recording it like handle_action."""
+    before = room.history.capture(room)
+    game_action, messages = room.apply_action(room.get_current_player().sid, action, amount)
+    assert game_action is not None, messages
+    room.history.record(before)
+
+
+def test_undo_and_redo_an_action():
+    room = make_room("Alice", "Bob", "Carol")
+    start = state(room)
+
+    act(room, "raise", 1)
+    after = state(room)
+    assert after != start
+
+    assert room.history.undo(room)
+    assert state(room) == start
+    assert room.history.redo(room)
+    assert state(room) == after
+
+
+def test_undo_restores_the_hand_after_a_fold_ends_it():
+    room = make_room("Alice", "Bob")
+    start = state(room)
+
+    act(room, "fold")
+    assert room.pot == 0
+
+    assert room.history.undo(room)
+    assert state(room) == start
+    assert len(room.in_hand) == 2
+
+
+def test_new_action_clears_redo():
+    room = make_room("Alice", "Bob", "Carol")
+    act(room, "call")
+    assert room.history.undo(room)
+
+    act(room, "fold")
+    assert not room.history.redo(room)
+
+
+def test_history_is_bounded():
+    room = make_room("Alice", "Bob")
+    for _ in range(UNDO_LIMIT + 5):
+        act(room, "raise", 0.01)
+
+    undone = 0
+    while room.history.undo(room):
+        undone += 1
+    assert undone == UNDO_LIMIT
+    assert room.pot > room.small_blind_amount + room.big_blind_amount
+
+
+def test_seat_change_invalidates_history():
+    room = make_room("Alice", "Bob", "Carol")
+    act(room, "call")
+
+    room.remove_player("sid-2")
+    chips = [p.chips for p in room.players]
+
+    assert not room.history.undo(room)
+    assert [p.chips for p in room.players] == chips
+    assert not room.history.undo_stack and not room.history.redo_stack
+
+
+def test_unchanged_parts_are_shared_between_snapshots():
+    room = make_room("Alice", "Bob", "Carol")
+    first = room.history.capture(room)
+    act(room, "call")
+    second = room.history.capture(room)
+
+    assert second["seats"] is first["seats"]
+    assert second["chips"] is not first["chips"]
@@ -0,0 +1,84 @@
+import pytest
+
+import ratelimit
+from ratelimit import RateLimiter
+
+
+class Clock:
+    """Stands in for the time module inside ratelimit."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(ratelimit, "time", clock)
+    return clock
+
+
+def allowed(limiter, count, event="action", sid="s1", ip=None):
+    """How many of `count` back-to-back events get through."""
+    return sum(limiter.allow(event, sid, ip) for _ in range(count))
+
+
+def test_burst_then_refill(clock):
+    limiter = RateLimiter({"action": (2, 5)}, (1, 1))
+    assert allowed(limiter, 10) == 5
+
+    clock.now += 1  # 2 tokens per second
+    assert allowed(limiter, 10) == 2
+
+    clock.now += 60  # Refill never exceeds the burst size
+    assert allowed(limiter, 10) == 5
+
+
+def test_events_and_sids_have_separate_buckets(clock):
+    limiter = RateLimiter({"action": (1, 2)}, (1, 3))
+    assert allowed(limiter, 5) == 2
+    assert allowed(limiter, 5, event="undo") == 3  # Unlisted: default limit
+    assert allowed(limiter, 5, sid="s2") == 2
+
+
+def test_ip_limit_spans_sids(clock):
+    limiter = RateLimiter({"action": (1, 2)}, (1, 1), ip_multiplier=3)
+    results = [allowed(limiter, 5, sid=f"s{i}", ip="10.0.0.1") for i in range(4)]
+
+    assert results == [2, 2, 2, 0]  # IP bucket holds 2 * 3 tokens
+    # Each SID is checked first: 3 over its own limit, and s3's 2 remaining
+    # events are then refused by the shared IP bucket
+    assert limiter.rejections == {("action", "sid"): 12, ("action", "ip"): 2}
+    assert limiter.metrics()["rejections"] == {"action:sid": 12, "action:ip": 2}
+
+
+def test_ip_only_check(clock):
+    limiter = RateLimiter({"connect": (1, 2)}, (1, 1), ip_multiplier=2)
+    assert allowed(limiter, 10, event="connect", sid=None, ip="10.0.0.1") == 4
+    assert limiter.rejections == {("connect", "ip"): 6}
+    assert len(limiter.buckets) == 1
+
+
+def test_idle_buckets_expire(clock):
+    limiter = RateLimiter({}, (1, 1), idle_ttl=300)
+    limiter.allow("action", "old", "10.0.0.1")
+    clock.now += 200
+    limiter.allow("action", "new", None)
+    assert len(limiter.buckets) == 3
+
+    clock.now += 150  # "old" and its IP are idle for 350s, "new" for 150s
+    limiter.allow("action", "new", None)
+    assert list(limiter.buckets) == [("sid", "new", "action")]
+
+
+def test_bucket_count_is_capped(clock):
+    limiter = RateLimiter({}, (1, 1), max_buckets=3)
+    for sid in ("a", "b", "c"):
+        limiter.allow("action", sid, None)
+    limiter.allow("action", "a", None)  # "a" is now the most recently used
+    limiter.allow("action", "d", None)
+
+    assert [key[1] for key in limiter.buckets] == ["c", "a", "d"]
@@ -0,0 +1,72 @@
+import pytest
+
+from static_cache import IMMUTABLE_CACHE_CONTROL, REVALIDATE_CACHE_CONTROL
+
+BUNDLE = "console.log('poker chip tracker');\n" * 50
+
+
+@pytest.fixture
+def client(make_app, tmp_path):
+    dist = tmp_path / "dist"
+    (dist / "assets").mkdir(parents=True)
+    (dist / "index.html").write_text("<!doctype html><div id=root></div>" * 20)
+    (dist / "assets" / "index-3f9a1c.js").write_text(BUNDLE)
+    return make_app(FRONTEND_DIST=str(dist)).test_client()
+
+
+def test_hashed_asset_is_immutable(client):
+    response = client.get("/assets/index-3f9a1c.js")
+    assert response.status_code == 200
+    assert response.headers["Cache-Control"] == IMMUTABLE_CACHE_CONTROL
+    assert response.get_data(as_text=True) == BUNDLE
+
+
+def test_pages_must_revalidate(client):
+    for path in ("/", "/app"):
+        assert client.get(path).headers["Cache-Control"] == REVALIDATE_CACHE_CONTROL
+
+
+def test_gzip_served_only_when_accepted(client):
+    plain = client.get("/assets/index-3f9a1c.js")
+    gzipped = client.get("/assets/index-3f9a1c.js", headers={"Accept-Encoding": "gzip"})
+
+    assert "Content-Encoding" not in plain.headers
+    assert gzipped.headers["Content-Encoding"] == "gzip"
+    assert len(gzipped.data) < len(plain.data)
+    assert gzipped.headers["ETag"] != plain.headers["ETag"]
+    assert gzipped.headers["Vary"] == "Accept-Encoding"
+
+
+def test_matching_etag_returns_304(client):
+    first = client.get("/assets/index-3f9a1c.js", headers={"Accept-Encoding": "gzip"})
+    second = client.get("/assets/index-3f9a1c.js", headers={
+        "Accept-Encoding": "gzip", "If-None-Match": first.headers["ETag"]})
+
+    assert second.status_code == 304
+    assert second.data == b""
+    assert second.headers["ETag"] == first.headers["ETag"]
+    assert second.headers["Cache-Control"] == IMMUTABLE_CACHE_CONTROL
+
+
+def test_etag_of_other_encoding_does_not_match(client):
+    gzip_etag = client.get("/", headers={"Accept-Encoding": "gzip"}).headers["ETag"]
+    response = client.get("/", headers={"If-None-Match": gzip_etag})
+
+    assert response.status_code == 200
+    assert response.headers["ETag"] != gzip_etag
+
+
+def test_star_if_none_match_returns_304(client):
+    assert client.get("/", headers={"If-None-Match": "*"}).status_code == 304
+
+
+def test_stale_etag_returns_200(client):
+    assert client.get("/", headers={"If-None-Match": '"stale"'}).status_code == 200
+
+
+def test_missing_asset_404s(client):
+    assert client.get("/assets/missing.js").status_code == 404
+
+
+def test_frontend_404s_when_not_built(make_app):
+    assert make_app().test_client().get("/app").status_code == 404
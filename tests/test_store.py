@@ -0,0 +1,242 @@
+import json
+
+import pytest
+
+from game import Player, PokerRoom
+from store import SWEEP_INTERVAL, RedisBackend, RoomStore, SQLiteBackend, open_store
+
+
+def make_room(code="ABCDE"):
+    room = PokerRoom(code, leader_sid="s1")
+    room.add_player(Player("s1", "Alice"))
+    room.add_player(Player("s2", "Bob"))
+    room.start_hand()
+    room.place_bet("s1", 0.10)
+    return room
+
+
+# ============================================================================
+# REDIS BACKEND
+# ============================================================================
+
+def test_redis_pipelined_set_del_get(resp_stub):
+    host, port = resp_stub.server_address
+    backend = RedisBackend(host, port)
+
+    backend.write_many({"AAAAA": "one", "BBBBB": "two"})
+    backend.write_many({"AAAAA": None, "BBBBB": "three"})
+
+    assert backend.read("AAAAA") is None
+    assert backend.read("BBBBB") == "three"
+    assert resp_stub.dbs[0] == {"room:BBBBB": "three"}
+    assert [c[1] for c in resp_stub.commands] == ["SET", "SET", "DEL", "SET", "GET", "GET"]
+    backend.close()
+
+
+def test_redis_sets_expiry(resp_stub):
+    host, port = resp_stub.server_address
+    RedisBackend(host, port, ttl=3600).write_many({"AAAAA": "one"})
+    RedisBackend(host, port, ttl=None).write_many({"BBBBB": "two"})
+
+    assert resp_stub.commands == [(0, "SET", "room:AAAAA", "one", "EX", "3600"),
+                                  (0, "SET", "room:BBBBB", "two")]
+
+
+def test_redis_missing_key_reads_none(resp_stub):
+    host, port = resp_stub.server_address
+    backend = RedisBackend(host, port)
+    assert backend.read("NOPE0") is None
+    backend.close()
+
+
+def test_redis_select_db(resp_stub):
+    host, port = resp_stub.server_address
+    backend = RedisBackend(host, port, db=3)
+    backend.write_many({"CCCCC": "state"})
+
+    assert resp_stub.commands[0] == (0, "SELECT", "3")
+    assert resp_stub.dbs[3] == {"room:CCCCC": "state"}
+    assert "room:CCCCC" not in resp_stub.dbs.get(0, {})
+    backend.close()
+
+
+def test_redis_reconnects_after_connection_loss(resp_stub):
+    host, port = resp_stub.server_address
+    backend = RedisBackend(host, port, db=2)
+    backend.write_many({"DDDDD": "before"})
+
+    resp_stub.drop_connections()
+    backend.write_many({"DDDDD": "after"})
+
+    assert backend.read("DDDDD") == "after"
+    assert resp_stub.dbs[2] == {"room:DDDDD": "after"}
+    backend.close()
+
+
+def test_redis_error_reply_raises_and_keeps_connection_in_sync(resp_stub):
+    host, port = resp_stub.server_address
+    backend = RedisBackend(host, port)
+    with pytest.raises(RuntimeError):
+        backend._execute([("SET", "k", "v"), ("BOGUS",), ("GET", "k")])
+    assert backend.read("EEEEE") is None
+    backend.close()
+
+
+def test_redis_store_round_trip(resp_stub):
+    host, port = resp_stub.server_address
+    url = f"redis://{host}:{port}/1"
+    room = make_room()
+
+    store = open_store(url)
+    store[room.code] = room
+    store.close()
+
+    reopened = open_store(url)
+    assert reopened[room.code].to_dict() == room.to_dict()
+    reopened.close()
+
+# ============================================================================
+# SQLITE BACKEND
+# ============================================================================
+
+def test_sqlite_round_trip(tmp_path):
+    url = f"sqlite:///{tmp_path / 'rooms.db'}"
+    room = make_room()
+
+    store = open_store(url)
+    store[room.code] = room
+    store["ZZZZZ"] = make_room("ZZZZZ")
+    del store["ZZZZZ"]
+    store.close()
+
+    reopened = open_store(url)
+    assert reopened[room.code].to_dict() == room.to_dict()
+    assert "ZZZZZ" not in reopened
+    reopened.close()
+
+
+def test_sqlite_uses_wal(tmp_path):
+    backend = SQLiteBackend(str(tmp_path / "rooms.db"))
+    assert backend.conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    backend.close()
+
+
+def test_sqlite_rooms_expire(tmp_path, monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr("store.time.time", lambda: clock[0])
+    backend = SQLiteBackend(str(tmp_path / "rooms.db"), ttl=60)
+    backend.write_many({"OLD00": "old"})
+
+    clock[0] += 30
+    backend.write_many({"NEW00": "new"})
+    assert backend.read("OLD00") == "old"
+
+    # Expired rows are hidden at once and swept on a later write
+    clock[0] += 45
+    assert backend.read("OLD00") is None
+    assert backend.read("NEW00") == "new"
+    clock[0] += SWEEP_INTERVAL
+    backend.write_many({"NEW00": "newer"})
+    codes = [row[0] for row in backend.conn.execute("SELECT code FROM rooms")]
+    assert codes == ["NEW00"]
+    backend.close()
+
+
+def test_sqlite_adds_expiry_column_to_old_databases(tmp_path):
+    import sqlite3
+    path = str(tmp_path / "rooms.db")
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE rooms (code TEXT PRIMARY KEY, state TEXT NOT NULL)")
+    conn.execute("INSERT INTO rooms VALUES ('KEEP0', 'state')")
+    conn.commit()
+    conn.close()
+
+    backend = SQLiteBackend(path)
+    assert backend.read("KEEP0") == "state"
+    backend.close()
+
+
+def test_reloaded_seats_are_disconnected(tmp_path):
+    url = f"sqlite:///{tmp_path / 'rooms.db'}"
+    store = open_store(url)
+    store["ABCDE"] = make_room()
+    store.close()
+
+    reopened = open_store(url)
+    room = reopened["ABCDE"]
+    assert [p.connected for p in room.players] == [False, False]
+    assert not room.has_connected_players()
+
+    bob = room.reclaim_seat("Bob", "new-bob")
+    assert bob is room.players[1] and bob.connected
+    assert room.leader_sid == "new-bob"  # Alice (the leader) hasn't come back yet
+    assert room.reclaim_seat("Bob", "another") is None
+
+    alice = room.reclaim_seat("Alice", "new-alice")
+    assert set(room.bets) == {"new-alice", "new-bob"}
+    assert room.bets["new-alice"] == 0.10
+    assert room.players_to_act <= {"new-alice", "new-bob"}
+    assert alice.chips == room.starting_chips - 0.10
+    reopened.close()
+
+# ============================================================================
+# WRITE-BEHIND
+# ============================================================================
+
+class FlakyBackend:
+    """Fails the first write, then behaves like a dict."""
+
+    def __init__(self):
+        self.data = {}
+        self.failures = 1
+
+    def read(self, code):
+        return self.data.get(code)
+
+    def write_many(self, changes):
+        if self.failures:
+            self.failures -= 1
+            raise OSError("backend down")
+        for code, state in changes.items():
+            if state is None:
+                self.data.pop(code, None)
+            else:
+                self.data[code] = state
+
+    def close(self):
+        pass
+
+
+def test_failed_flush_is_retried_without_losing_newer_updates():
+    backend = FlakyBackend()
+    store = RoomStore(backend, max_lag=60)
+    room = make_room()
+    store[room.code] = room
+
+    with pytest.raises(OSError):
+        store.flush()
+    assert room.code in store.pending
+
+    room.pot = 99
+    store.save(room)
+    store.flush()
+
+    assert json.loads(backend.data[room.code])["pot"] == 99
+    assert store.pending == {}
+    store.close()
+
+
+def test_repeated_saves_coalesce():
+    backend = FlakyBackend()
+    backend.failures = 0
+    store = RoomStore(backend, max_lag=60)
+    room = make_room()
+    store[room.code] = room
+    for pot in range(50):
+        room.pot = pot
+        store.save(room)
+
+    assert len(store.pending) == 1
+    store.flush()
+    assert json.loads(backend.data[room.code])["pot"] == 49
+    store.close()